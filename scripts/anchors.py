@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Streaming anchor extraction for site_keyword_scan.
+- One pass over the HTML with html.parser events; no document tree is built
+- Emits (href, text) per <a href=...> in document order, with text joined the way
+  BeautifulSoup's get_text(" ", strip=True) does (stripped strings, single spaces)
+- Optional lxml fast path when lxml is installed (backend="auto" picks it)
+"""
+
+from __future__ import annotations
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+try:
+    import lxml.html as lxml_html
+except Exception:
+    lxml_html = None
+
+SKIP_TEXT_TAGS = {"script", "style", "template"}
+
+class _AnchorParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: List[Optional[Tuple[str, str]]] = []
+        self._open: List[Tuple[int, str, List[str]]] = []  # (slot in out, href, text parts)
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TEXT_TAGS:
+            self._skip += 1
+        elif tag == "a":
+            href = None
+            for k, v in attrs:
+                if k == "href":
+                    href = v or ""
+                    break
+            if href is not None:
+                # reserve the slot now so nested anchors still come out in start-tag order
+                self.out.append(None)
+                self._open.append((len(self.out) - 1, href, []))
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TEXT_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "a" and self._open:
+            self._emit(self._open.pop())
+
+    def handle_data(self, data):
+        if self._skip or not self._open:
+            return
+        s = data.strip()
+        if s:
+            for _, _, parts in self._open:
+                parts.append(s)
+
+    def _emit(self, item):
+        slot, href, parts = item
+        self.out[slot] = (href, " ".join(parts))
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._emit(self._open.pop())
+
+def _extract_stdlib(html: str) -> List[Tuple[str, str]]:
+    p = _AnchorParser()
+    p.feed(html)
+    p.close()
+    return [a for a in p.out if a is not None]
+
+def _extract_lxml(html: str) -> List[Tuple[str, str]]:
+    root = lxml_html.fromstring(html)
+    out = []
+    for a in root.iter("a"):
+        href = a.get("href")
+        if href is None:
+            continue
+        parts = [t.strip() for t in a.itertext() if t.strip()]
+        out.append((href, " ".join(parts)))
+    return out
+
+def extract_anchors(html: str, backend: str = "auto") -> List[Tuple[str, str]]:
+    """All (href, text) pairs for anchors carrying an href attribute."""
+    if not html:
+        return []
+    if backend == "lxml" and lxml_html is None:
+        raise ImportError("extract_anchors(backend=\"lxml\") needs lxml (pip install lxml); use backend=\"auto\" to fall back")
+    if backend == "lxml" or (backend == "auto" and lxml_html is not None):
+        try:
+            return _extract_lxml(html)
+        except Exception:
+            if backend == "lxml":
+                raise
+    return _extract_stdlib(html)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Atomic, streamed writes for canonical datasets and generated summaries.
+- Output goes to a temp file in the target's directory, is fsynced, then os.replace()d into place:
+  a crash mid-write leaves the previous file intact
+- Rows are written as they come from an iterator (no full in-memory copy of the file)
+- When the new bytes equal the current file, the temp file is dropped and the target is left
+  untouched (same mtime, no git diff for the workflows to commit)
+"""
+
+from __future__ import annotations
+import csv, filecmp, os, pathlib, tempfile
+from typing import Iterable, List, Mapping
+
+class AtomicWrite:
+    """
+    with AtomicWrite(path) as f: ...   # text file handle on the temp file (binary with mode="wb")
+    .changed is True when the target was replaced; call .discard() inside the block to
+    throw the output away instead (an exception in the block does the same).
+    """
+
+    def __init__(self, path: pathlib.Path, newline: str = "", encoding: str = "utf-8", mode: str = "w"):
+        self.path = pathlib.Path(path)
+        self.mode = mode
+        self.newline = newline
+        self.encoding = encoding
+        self.changed = False
+        self._discard = False
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        self.tmp = pathlib.Path(tmp)
+        if "b" in self.mode:
+            self.file = os.fdopen(fd, self.mode)
+        else:
+            self.file = os.fdopen(fd, self.mode, newline=self.newline, encoding=self.encoding)
+        return self.file
+
+    def discard(self) -> None:
+        self._discard = True
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and not self._discard:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            self.file.close()
+            if exc_type is not None or self._discard:
+                return False
+            if self.path.exists() and filecmp.cmp(self.tmp, self.path, shallow=False):
+                return False
+            if self.path.exists():
+                os.chmod(self.tmp, self.path.stat().st_mode & 0o7777)
+            else:
+                os.chmod(self.tmp, 0o666 & ~_umask())
+            os.replace(self.tmp, self.path)
+            self.changed = True
+            _fsync_dir(self.path.parent)
+        finally:
+            if not self.changed:
+                self.tmp.unlink(missing_ok=True)
+        return False
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def _fsync_dir(path: pathlib.Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def write_rows(path: pathlib.Path, headers: List[str], rows: Iterable[Mapping]) -> bool:
+    """Stream dict rows (missing fields -> "") into `path`; returns True if the file changed."""
+    aw = AtomicWrite(path)
+    with aw as f:
+        w = csv.writer(f)
+        w.writerow(headers)
+        for r in rows:
+            w.writerow([r.get(h, "") for h in headers])
+    return aw.changed
+
+def write_frame(path: pathlib.Path, df) -> bool:
+    """pandas DataFrame -> CSV (index dropped), same bytes as df.to_csv(path, index=False)."""
+    aw = AtomicWrite(path)
+    with aw as f:
+        df.to_csv(f, index=False)
+    return aw.changed
+
+def write_text(path: pathlib.Path, text: str, encoding: str = "utf-8") -> bool:
+    aw = AtomicWrite(path, newline=None, encoding=encoding)
+    with aw as f:
+        f.write(text)
+    return aw.changed
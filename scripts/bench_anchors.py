@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BeautifulSoup anchor walk (old site_keyword_scan path) vs streaming extractor.
+
+Usage:
+  python scripts/bench_anchors.py [page.html ...] [--cache] [--repeat N]
+
+With no paths, uses the saved pages in scripts/fixtures/ (a committee homepage, a broadcast
+landing page with uppercase / unquoted markup, a docket table); --cache uses the HTML pages saved
+by the last sweep in data/cache/http/ instead. Also checks that both paths yield the same
+(href, text) pairs.
+"""
+
+from __future__ import annotations
+import argparse, json, pathlib, sys, time
+
+from anchors import extract_anchors, lxml_html
+
+try:
+    from bs4 import BeautifulSoup
+except Exception:
+    BeautifulSoup = None
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / "data" / "cache" / "http"
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+def cached_html_pages() -> list[pathlib.Path]:
+    index = CACHE_DIR / "index.json"
+    if not index.exists():
+        return []
+    from http_cache import url_key
+    meta = json.loads(index.read_text(encoding="utf-8"))
+    return [CACHE_DIR / f"{url_key(u)}.body" for u, m in sorted(meta.items())
+            if "text/html" in m.get("content_type","")]
+
+def bs4_anchors(html: str) -> list[tuple[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
+    return [(a["href"], a.get_text(" ", strip=True)) for a in soup.find_all("a", href=True)]
+
+def timed(fn, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = [fn(h) for h in pages]
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="*")
+    ap.add_argument("--cache", action="store_true", help="benchmark the pages cached by the last sweep")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    paths = [pathlib.Path(p) for p in args.paths] or (cached_html_pages() if args.cache else sorted(FIXTURES.glob("*.html")))
+    if not paths:
+        sys.exit("No HTML pages: pass file paths, or run search_agent.py once to populate data/cache/http/ for --cache.")
+    pages = [p.read_bytes().decode("utf-8", errors="replace") for p in paths]
+    size = sum(len(h) for h in pages)
+    print(f"{len(pages)} page(s), {size/1024:.0f} KiB, best of {args.repeat}")
+
+    contenders = [("stdlib stream", lambda h: extract_anchors(h, backend="stdlib"))]
+    if lxml_html is not None:
+        contenders.append(("lxml", lambda h: extract_anchors(h, backend="lxml")))
+    baseline = None
+    if BeautifulSoup is not None:
+        t, baseline = timed(bs4_anchors, pages, args.repeat)
+        print(f"{'bs4 html.parser':<16} {t*1000:9.1f} ms")
+    for name, fn in contenders:
+        t2, out = timed(fn, pages, args.repeat)
+        line = f"{name:<16} {t2*1000:9.1f} ms"
+        if baseline is not None:
+            same = sum(a == b for a, b in zip(out, baseline))
+            line += f"  x{t/t2:5.1f}  identical pages: {same}/{len(pages)}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
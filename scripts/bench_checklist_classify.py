@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: checklist section routing, the previous per-section test chain vs the single-pass
+build_checklist.classify_master on a synthetic timeline of N rows.
+
+Rows recombine real event / location / source / note values with section triggers (C-SPAN, ECF,
+wire photos, House Oversight video; direct, generic, courtlistener or missing links; TBD notes),
+so every section and every link-quality branch is exercised. Entries are compared row by row.
+
+Usage: python scripts/bench_checklist_classify.py [--rows 100000] [--reps 3]
+"""
+
+from __future__ import annotations
+import argparse, csv, pathlib, random, re, time
+
+from build_checklist import MEDIA_TOKENS, classify_master, has_tbd, is_generic_placeholder, looks_like_direct_video_link
+from records import MasterRow
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_CSV = ROOT / "data" / "master" / "master_timeline.csv"
+
+EVENT_TRIGGERS = ["C-SPAN hearing segment", "ECF 1320 unsealed", "Unseal order, ECF 12.5", "Reuters wire photos",
+                  "GETTY images set", "Hearing VIDEO posted", "Wire: arrival", ""]
+LOCATIONS = ["SDNY Docket", "House Oversight Committee", "sdny docket (Manhattan)", "Washington DC"]
+LINKS = ["", "https://www.c-span.org/", "https://www.c-span.org/video/?123/hearing", "https://youtu.be/x",
+         "https://www.reuters.com/world/us/", "https://oversight.house.gov", "https://oversight.house.gov/hearing/x",
+         "https://www.courtlistener.com/docket/4355835/", "https://example.org/story"]
+NOTES = ["", "TBD", "add specific clip ID", "ID pending", "checked", "to be determined"]
+
+def old_classify_master(r) -> dict:
+    """The per-section test chain build_checklist used before classify_master."""
+    out = {}
+    date, loc, event = r.get("date",""), r.get("location",""), r.get("event","")
+    srcs, notes = r.get("source_urls",""), r.get("notes","")
+    if "C-SPAN" in event.upper():
+        verified = "✅" if looks_like_direct_video_link(srcs) else "☐"
+        if verified == "☐" and (has_tbd(notes) or is_generic_placeholder(srcs) or not srcs):
+            out["cspan"] = [event, date, loc, "TBD", verified, notes]
+    if "SDNY DOCKET" in loc.upper() and ("ECF" in event.upper() or "UNSEAL" in event.upper()):
+        verified_link = "✅" if ("courtlistener.com/docket" in srcs and not has_tbd(notes)) else "☐"
+        if verified_link == "☐":
+            m = re.search(r"ECF\s*([0-9]+(?:\.[0-9]+)?)", event, re.I)
+            out["sdny"] = [m.group(1) if m else "—", event, date, verified_link, srcs or ""]
+    if any(tok in event for tok in MEDIA_TOKENS):
+        generic = is_generic_placeholder(srcs)
+        verified = "✅" if (srcs and not generic) else "☐"
+        if verified == "☐" and (has_tbd(notes) or generic or not srcs):
+            out["media"] = [date, loc, event, "TBD", verified, notes]
+    if "HOUSE OVERSIGHT" in loc.upper() and "VIDEO" in event.upper():
+        verified = "✅" if looks_like_direct_video_link(srcs) else "☐"
+        if verified == "☐":
+            out["oversight"] = [date, event, "TBD", verified, notes]
+    dse = (r.get("deep_search_event","") or "").lower()
+    if not dse or dse == "pending":
+        out["deep_event"] = [date, loc, event, r.get("participants_on_record",""), r.get("deep_search_notes","")]
+    return out
+
+def synthetic_rows(real: list, n: int, rnd: random.Random) -> list:
+    rows = []
+    for _ in range(n):
+        a, b = rnd.choice(real), rnd.choice(real)
+        trigger = rnd.random() < 0.3
+        event = f"{rnd.choice(EVENT_TRIGGERS)} {a.event}" if trigger else a.event
+        loc = rnd.choice(LOCATIONS) if rnd.random() < 0.2 else b.location
+        srcs = rnd.choice(LINKS) if trigger else a.source_urls
+        notes = rnd.choice(NOTES) if rnd.random() < 0.5 else b.notes
+        status = rnd.choice(["", "pending", "done", "Pending"])
+        rows.append(MasterRow(a.date, loc, event, a.participants_on_record, srcs, notes, status, b.deep_search_notes))
+    return rows
+
+def best_of(reps: int, fn):
+    best, out = None, None
+    for _ in range(reps):
+        t = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=str(DEFAULT_CSV))
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--reps", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        real = [MasterRow.from_mapping(r) for r in csv.DictReader(f)]
+    rows = synthetic_rows(real, args.rows, random.Random(args.seed))
+
+    t_old, old = best_of(args.reps, lambda: [old_classify_master(r) for r in rows])
+    t_new, new = best_of(args.reps, lambda: [classify_master(r) for r in rows])
+    counts = {}
+    for e in new:
+        for k in e:
+            counts[k] = counts.get(k, 0) + 1
+    print(f"{len(rows)} rows; entries per section: {dict(sorted(counts.items()))}")
+    print(f"test chain {t_old:6.2f} s   single pass {t_new:6.2f} s   x{t_old / t_new:.2f}   identical={old == new}")
+
+if __name__ == "__main__":
+    main()
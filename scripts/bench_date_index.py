@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: overlap queries through date_index.DateIndex vs a linear scan of parsed spans.
+
+N synthetic rows mix day, month, year and range dates (1990-2024); Q random windows
+(single days, months, +/- N days) are answered both ways and the results compared.
+
+Usage: python scripts/bench_date_index.py [--rows 100000] [--queries 2000]
+"""
+
+from __future__ import annotations
+import argparse, random, time
+
+from date_index import DateIndex, window
+from timeline_dates import parse_span
+
+def synthetic_date(rnd: random.Random) -> str:
+    y, m, d = rnd.randint(1990, 2024), rnd.randint(1, 12), rnd.randint(1, 28)
+    kind = rnd.random()
+    if kind < 0.6:
+        return f"{y}-{m:02d}-{d:02d}"
+    if kind < 0.8:
+        return f"{y}-{m:02d}"
+    if kind < 0.9:
+        return f"{y}"
+    return f"{y}-{m:02d}-{d:02d}–{y + rnd.randint(0, 2)}-{rnd.randint(1, 12):02d}"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    dates = [synthetic_date(rnd) for _ in range(args.rows)]
+    queries = []
+    for _ in range(args.queries):
+        d = synthetic_date(rnd).split("–")[0]
+        queries.append(window(d, days=rnd.choice([0, 0, 3, 30])))
+
+    t = time.perf_counter()
+    idx = DateIndex()
+    for i, d in enumerate(dates):
+        idx.add_value(d, i)
+    idx.overlapping(*queries[0])
+    t_build = time.perf_counter() - t
+
+    spans = [parse_span(d) for d in dates]
+    t = time.perf_counter()
+    scan = [[i for i, s in enumerate(spans) if s and s.start <= hi and s.end >= lo] for lo, hi in queries]
+    t_scan = time.perf_counter() - t
+    t = time.perf_counter()
+    got = [idx.overlapping(lo, hi) for lo, hi in queries]
+    t_index = time.perf_counter() - t
+
+    same = all(sorted(g) == s for g, s in zip(got, scan))
+    hits = sum(map(len, got))
+    print(f"{args.rows} rows, {args.queries} queries, {hits} hits  build {t_build:.2f} s")
+    print(f"linear scan {t_scan:7.2f} s   index {t_index:6.3f} s   x{t_scan / t_index:,.0f}   identical={same}")
+
+if __name__ == "__main__":
+    main()
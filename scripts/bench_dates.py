@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: strptime-loop date keys (previous import_pending/update_timeline code) vs timeline_dates.
+
+- sort:     sorting the timeline rows by date key, as merge_master does
+- validate: the update_timeline date check over every row
+Both run on the real timeline (many repeated dates), repeated --reps times. Results are
+checked for equality, plus a set of edge-case strings (ranges, bad days, short months).
+
+Usage: python scripts/bench_dates.py [path/to/master_timeline.csv] [--reps N]
+"""
+
+from __future__ import annotations
+import argparse, csv, pathlib, time
+from datetime import datetime
+
+import timeline_dates
+from timeline_dates import parse_date_key, parse_span
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_CSV = ROOT / "data" / "master" / "master_timeline.csv"
+
+EDGE_CASES = ["", "2024", "2024-1", "2024-01", "2024-1-5", "2024-01- 5", "2024-02-30", "2023-02-29",
+              "0000", "0001-01-01", "2024-13", "2024-00", "24-01-01", "2024 ", " 2024", "2024-01-01T00",
+              "2019-07-20–2019-08-20", "2019-07-20 – 2019-08", "2019–", "–2019", "undated", "c. 1990"]
+
+def old_parse_date_key(d: str) -> tuple:
+    if "–" in d:
+        d = d.split("–",1)[0].strip()
+    for fmt in ("%Y-%m-%d","%Y-%m","%Y"):
+        try:
+            dt = datetime.strptime(d, fmt)
+            return (0, dt.year, dt.month if fmt != "%Y" else 1, dt.day if fmt == "%Y-%m-%d" else 1, d)
+        except ValueError:
+            pass
+    return (1, 9999, 12, 31, d or "~")
+
+def old_is_standard(val: str) -> bool:
+    if "–" in val:
+        val = val.split("–")[0].strip()
+    for fmt in ("%Y-%m-%d","%Y-%m","%Y"):
+        try:
+            datetime.strptime(val, fmt)
+            return True
+        except ValueError:
+            pass
+    return False
+
+def clock(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=str(DEFAULT_CSV))
+    ap.add_argument("--reps", type=int, default=20)
+    args = ap.parse_args()
+
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    dates = [(r.get("date","") or "").strip() for r in rows]
+    print(f"{len(dates)} rows, {len(set(dates))} distinct date strings, {args.reps} reps")
+
+    edge_ok = all(old_parse_date_key(s) == parse_date_key(s) and old_is_standard(s) == (parse_span(s) is not None)
+                  for s in EDGE_CASES)
+    print(f"edge cases identical: {edge_ok}")
+
+    def sort_old():
+        return [sorted(rows, key=lambda r: (old_parse_date_key(r["date"]), r["location"].lower())) for _ in range(args.reps)][-1]
+    def sort_new():
+        parse_date_key.cache_clear(); parse_span.cache_clear()
+        return [sorted(rows, key=lambda r: (parse_date_key(r["date"]), r["location"].lower())) for _ in range(args.reps)][-1]
+    t0, a = clock(sort_old)
+    t1, b = clock(sort_new)
+    print(f"sort     strptime {t0:7.3f} s   timeline_dates {t1:7.3f} s  x{t0/t1:5.1f}  identical: {a == b}")
+
+    def validate_old():
+        return [[old_is_standard(d) for d in dates if d] for _ in range(args.reps)][-1]
+    def validate_new():
+        parse_span.cache_clear()
+        return [[parse_span(d) is not None for d in dates if d] for _ in range(args.reps)][-1]
+    t0, a = clock(validate_old)
+    t1, b = clock(validate_new)
+    print(f"validate strptime {t0:7.3f} s   timeline_dates {t1:7.3f} s  x{t0/t1:5.1f}  identical: {a == b}")
+    print(f"cache: {timeline_dates.parse_span.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-keyword `in` checks vs the shared Aho-Corasick matcher on master_timeline.csv.
+
+A) search_agent-style: every row's keyword list (keywords_for_event) against a corpus made of
+   the timeline's own event/location/notes text (stand-in for fetched feed entries)
+     - naive:     all(k in text for k in kws) for every (row, text) pair
+     - automaton: one Matcher of all keywords; each text scanned once, rows resolved from hits
+     - index:     KeywordIndex (token postings, automaton-primed) as used by search_agent
+B) build_checklist-style: the per-row literal category tests on event/location
+
+Usage: python scripts/bench_matcher.py [path/to/master_timeline.csv] [--texts N]
+"""
+
+from __future__ import annotations
+import argparse, csv, pathlib, re, time
+from collections import Counter
+
+from multimatch import Matcher
+from keyword_index import KeywordIndex
+import build_checklist
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_CSV = ROOT / "data" / "master" / "master_timeline.csv"
+
+def keywords_for_event(row: dict) -> list[str]:
+    # same extraction as search_agent.keywords_for_event (kept local: no pandas/feedparser needed)
+    base = " ".join([str(row.get("event","")), str(row.get("location",""))])
+    tokens = [t for t in re.split(r"[^A-Za-z0-9]+", base) if len(t) >= 3]
+    return list(dict.fromkeys([t.lower() for t in tokens]))[:6] + ["epstein", "maxwell"]
+
+def clock(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+def naive(rows_kws, texts):
+    return [[i for i, t in enumerate(texts) if all(k in t for k in kws)] for kws in rows_kws]
+
+def automaton(rows_kws, texts):
+    m = Matcher((k, k) for kws in rows_kws for k in kws).build()
+    # anchor each row on its least common keyword; verify the rest against the text's hit set
+    freq = Counter(k for kws in rows_kws for k in set(kws))
+    by_anchor: dict[str, list[int]] = {}
+    for r, kws in enumerate(rows_kws):
+        by_anchor.setdefault(min(kws, key=lambda k: freq[k]), []).append(r)
+    kwsets = [set(kws) for kws in rows_kws]
+    out = [[] for _ in rows_kws]
+    for i, t in enumerate(texts):
+        present = m.scan(t)
+        for k in present:
+            for r in by_anchor.get(k, ()):
+                if kwsets[r] <= present:
+                    out[r].append(i)
+    return out
+
+def index(rows_kws, texts):
+    idx = KeywordIndex()
+    for t in texts:
+        idx.add(t, None)
+    idx.prime(k for kws in rows_kws for k in kws)
+    return [idx.match_ids(kws) for kws in rows_kws]
+
+def checklist_literals_in(rows):
+    out = []
+    for r in rows:
+        ev, loc = r["event"], r["location"]
+        out.append((
+            "C-SPAN" in ev.upper(),
+            "SDNY DOCKET" in loc.upper() and ("ECF" in ev.upper() or "UNSEAL" in ev.upper()),
+            any(tok in ev for tok in build_checklist.MEDIA_TOKENS),
+            "HOUSE OVERSIGHT" in loc.upper() and "VIDEO" in ev.upper(),
+        ))
+    return out
+
+# The checklist's literals as automata (build_checklist itself uses plain `in` tests)
+EVENT_MATCHER = Matcher([(tok, "media") for tok in build_checklist.MEDIA_TOKENS])
+for _pat, _tag in (("C-SPAN","cspan"), ("ECF","ecf"), ("UNSEAL","unseal"), ("VIDEO","video")):
+    EVENT_MATCHER.add(_pat, _tag, ignore_case=True)
+LOC_MATCHER = Matcher([("SDNY DOCKET","sdny"), ("HOUSE OVERSIGHT","oversight")])  # scanned on loc.upper()
+
+def checklist_literals_matcher(rows):
+    out = []
+    for r in rows:
+        ev = EVENT_MATCHER.scan(r["event"])
+        loc = LOC_MATCHER.scan(r["location"].upper())
+        out.append((
+            "cspan" in ev,
+            "sdny" in loc and ("ecf" in ev or "unseal" in ev),
+            "media" in ev,
+            "oversight" in loc and "video" in ev,
+        ))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=str(DEFAULT_CSV))
+    ap.add_argument("--texts", type=int, default=0, help="limit corpus size (default: one text per row)")
+    args = ap.parse_args()
+
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    rows_kws = [keywords_for_event(r) for r in rows]
+    texts = [" ".join([r.get("event",""), r.get("location",""), r.get("notes","")]).lower() for r in rows]
+    if args.texts:
+        texts = texts[:args.texts]
+    print(f"{len(rows)} rows x {len(texts)} texts, {len({k for kws in rows_kws for k in kws})} distinct keywords")
+
+    t0, base = clock(lambda: naive(rows_kws, texts))
+    print(f"A naive `in`     {t0:8.3f} s")
+    for name, fn in (("A automaton", automaton), ("A index+prime", index)):
+        t, out = clock(lambda: fn(rows_kws, texts))
+        print(f"{name:<16} {t:8.3f} s  x{t0/t:6.1f}  identical: {out == base}")
+
+    reps = max(1, 20000 // max(len(rows), 1))
+    t1, b1 = clock(lambda: [checklist_literals_in(rows) for _ in range(reps)])
+    t2, b2 = clock(lambda: [checklist_literals_matcher(rows) for _ in range(reps)])
+    print(f"B checklist `in` {t1:8.3f} s  ({reps} passes)")
+    print(f"B checklist AC   {t2:8.3f} s  x{t1/t2:6.1f}  identical: {b1 == b2}")
+
+if __name__ == "__main__":
+    main()
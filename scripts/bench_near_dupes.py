@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: near-duplicate screening (near_dupes.NearDupIndex) on a synthetic master of N rows.
+
+Rows are generated from the real timeline's vocabulary (random event/location phrases), then
+a batch of reworded copies (one word dropped/added) plus fresh rows is screened against them.
+- build:  signatures + LSH buckets for the whole master
+- query:  screening the batch (candidates from buckets, exact Jaccard confirmation)
+- recall: planted pairs whose exact Jaccard clears the threshold vs pairs the index reported,
+          and brute-force pairwise screening time over a sample, extrapolated to the master
+
+Usage: python scripts/bench_near_dupes.py [--rows 100000] [--batch 500] [--sample 2000]
+"""
+
+from __future__ import annotations
+import argparse, csv, pathlib, random, re, time
+
+from near_dupes import NearDupIndex, jaccard, shingles
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_CSV = ROOT / "data" / "master" / "master_timeline.csv"
+
+def synthetic_rows(words: list[str], n: int, rnd: random.Random) -> list[str]:
+    return [" ".join(rnd.choices(words, k=rnd.randint(5, 12))) for _ in range(n)]
+
+def reword(text: str, words: list[str], rnd: random.Random) -> str:
+    toks = text.split()
+    if len(toks) > 6 and rnd.random() < 0.5:
+        del toks[rnd.randrange(len(toks))]
+    else:
+        toks.insert(rnd.randrange(len(toks) + 1), rnd.choice(words))
+    return " ".join(toks)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=str(DEFAULT_CSV))
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--sample", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        text = " ".join(f"{r.get('event','')} {r.get('location','')}" for r in csv.DictReader(f))
+    words = sorted({w for w in re.findall(r"[A-Za-z]{3,}", text)})
+    master = synthetic_rows(words, args.rows, rnd)
+    planted = [(i, reword(master[i], words, rnd)) for i in rnd.sample(range(len(master)), args.batch // 2)]
+    batch = [s for _, s in planted] + synthetic_rows(words, args.batch - len(planted), rnd)
+    print(f"{len(words)} words, {len(master)} master rows, batch of {len(batch)}")
+
+    idx = NearDupIndex()
+    t = time.perf_counter()
+    for i, s in enumerate(master):
+        idx.add(i, s)
+    t_build = time.perf_counter() - t
+    t = time.perf_counter()
+    hits = [{i for i, _ in idx.query(s)} for s in batch]
+    t_query = time.perf_counter() - t
+    print(f"build {t_build:7.2f} s   query {t_query:6.2f} s   flagged {sum(map(bool, hits))}/{len(batch)}")
+
+    expected = {i for i, s in planted if jaccard(shingles(master[i]), shingles(s)) >= idx.threshold}
+    found = sum(1 for n, (i, _) in enumerate(planted) if i in hits[n] and i in expected)
+    print(f"recall on planted pairs above threshold: {found}/{len(expected)}")
+
+    sample = [shingles(s) for s in master[:args.sample]]
+    t = time.perf_counter()
+    for s in batch[:10]:
+        sh = shingles(s)
+        [jaccard(sh, o) for o in sample]
+    per_pair = (time.perf_counter() - t) / (10 * len(sample))
+    print(f"pairwise screening of the batch would be ~{per_pair * len(batch) * len(master):,.0f} s")
+
+if __name__ == "__main__":
+    main()
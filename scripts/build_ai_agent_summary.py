@@ -5,6 +5,8 @@
 from __future__ import annotations
 import json, csv, pathlib, urllib.parse
 
+from atomic_csv import write_rows
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
 LOGS = DATA / "ai_agent_logs"
@@ -94,27 +96,15 @@ def main():
         })
 
     # Write summary
-    OUT_SUM.parent.mkdir(parents=True, exist_ok=True)
-    with OUT_SUM.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "run_timestamp","total_hits","new_leads","unique_links",
-            "sources_count","new_sources_count","sources","new_sources"
-        ])
-        w.writeheader()
-        for r in summary_rows:
-            w.writerow(r)
+    write_rows(OUT_SUM, [
+        "run_timestamp","total_hits","new_leads","unique_links",
+        "sources_count","new_sources_count","sources","new_sources"
+    ], summary_rows)
 
     # Write sources index
-    with OUT_SRC.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=[
-            "source_domain","first_seen_run","last_seen_run","total_hits","unique_links"
-        ])
-        w.writeheader()
-        for src, agg in sorted(seen_sources.items(), key=lambda kv: kv[0]):
-            w.writerow({
-                "source_domain": src,
-                **agg
-            })
+    write_rows(OUT_SRC, [
+        "source_domain","first_seen_run","last_seen_run","total_hits","unique_links"
+    ], ({"source_domain": src, **agg} for src, agg in sorted(seen_sources.items(), key=lambda kv: kv[0])))
 
     print(f"Wrote {OUT_SUM} and {OUT_SRC}")
 
@@ -24,6 +24,9 @@ from pathlib import Path
 from typing import Dict, Any
 import pandas as pd
 
+from atomic_csv import write_frame, write_text
+import snapshots
+
 ROOT = Path(__file__).resolve().parents[1]
 D = ROOT / "data"
 P_MASTER = D / "master"
@@ -68,7 +71,7 @@ def current_version() -> tuple[int,int,int]:
 
 def write_version(ver: tuple[int,int,int]):
     VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-    VERSION_FILE.write_text(f"v{ver[0]}.{ver[1]}.{ver[2]}\n", encoding="utf-8")
+    write_text(VERSION_FILE, f"v{ver[0]}.{ver[1]}.{ver[2]}\n")
 
 def bump_version(kind: str, ver: tuple[int,int,int]) -> tuple[int,int,int]:
     major, minor, patch = ver
@@ -89,6 +92,9 @@ def semver_kind(changed: list[str]) -> str:
 
 def read_rows(path: Path) -> int:
     if not path.exists(): return 0
+    rows = snapshots.row_count(path)  # from a fresh columnar snapshot's metadata, if import_pending wrote one
+    if rows is not None:
+        return rows
     try:
         return len(pd.read_csv(path))
     except Exception:
@@ -139,8 +145,7 @@ def load_batches_csv() -> pd.DataFrame:
     return pd.DataFrame(columns=cols)
 
 def write_batches_csv(df: pd.DataFrame):
-    P_SUMMARY.mkdir(parents=True, exist_ok=True)
-    df.to_csv(CHANGELOG_CSV, index=False)
+    write_frame(CHANGELOG_CSV, df)
 
 def prepend_md(entry: str):
     if CHANGELOG_MD.exists():
@@ -149,9 +154,9 @@ def prepend_md(entry: str):
         current = ""
     header = "# 🧾 FREE-DOM — CHANGELOG\n\nAll notable changes are recorded by the `Auto Update` workflow.\n\n---\n\n"
     if current.startswith("# 🧾 FREE-DOM — CHANGELOG"):
-        CHANGELOG_MD.write_text(entry + current, encoding="utf-8")
+        write_text(CHANGELOG_MD, entry + current)
     else:
-        CHANGELOG_MD.write_text(header + entry + current, encoding="utf-8")
+        write_text(CHANGELOG_MD, header + entry + current)
 
 def render_md(version: str, ctx: Dict[str,Any], cnt: Dict[str,int], changed: list[str]) -> str:
     date_d = ctx["commit_date_iso"][:10]
@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import csv, pathlib, re
-from typing import List, Dict
+import argparse, json, pathlib, re
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from atomic_csv import write_text
+import date_index
+from records import MasterRow, PeopleRow, UnverifiedConnection, UnverifiedEvent, UnverifiedPerson, read_records
+from source_cache import file_sha256, load_versioned, text_digest
+import timeline_db
+from timeline_dates import parse_span
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
 CHECKLIST = ROOT / "CHECKLIST.md"
-
-# Master timeline + people files (with deep search fields)
-MT_FIELDS = ["date","location","event","participants_on_record","source_urls","notes","deep_search_event","deep_search_notes"]
-PEOPLE_FIELDS = ["date","location","event","person","role","source_urls","deep_search_person","deep_search_notes"]
+CHECKLIST_CACHE = DATA / "cache" / "checklist.json"  # per-section fragments + per-row classifications
+CACHE_VERSION = 1
+SHARD_DIR = ROOT / "docs" / "checklist"
+PAGE_ROWS = 250  # table rows per sharded page; longer sections / years continue on <name>-2.md, ...
 
 # Smart verification regexes
 RE_CSPAN_DIRECT = re.compile(r"c-span\.org/(video|clip|program)/", re.I)
@@ -18,18 +26,13 @@ RE_COMMITTEE_DIRECT = re.compile(r"(media\.house\.gov|oversight\.house\.gov/.+/(
 RE_REUTERS_GENERIC = re.compile(r"^https?://www\.reuters\.com/world/(us|americas)/?$", re.I)
 RE_CSPAN_GENERIC = re.compile(r"^https?://www\.c-span\.org/?$", re.I)
 RE_OVERSIGHT_GENERIC = re.compile(r"^https?://(www\.)?oversight\.house\.gov/?$", re.I)
+RE_TBD = re.compile(r"\bTBD\b|to be determined|add (specific|direct)|add .* ID|ID pending", re.I)
+RE_ECF = re.compile(r"ECF\s*([0-9]+(?:\.[0-9]+)?)", re.I)
 
-def read_csv(path: pathlib.Path, fields: List[str]) -> List[Dict]:
-    if not path.exists(): return []
-    with path.open(newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    out = []
-    for r in rows:
-        out.append({k: (r.get(k,"") or "").strip() for k in fields if k in r})
-    return out
+MEDIA_TOKENS = ["Reuters","GETTY","Wire","wire","Wire:"]
 
 def has_tbd(text: str) -> bool:
-    return bool(re.search(r"\bTBD\b|to be determined|add (specific|direct)|add .* ID|ID pending", text, flags=re.I))
+    return bool(RE_TBD.search(text))
 
 def looks_like_direct_video_link(urls: str) -> bool:
     return bool(RE_CSPAN_DIRECT.search(urls) or RE_YT_DIRECT.search(urls) or RE_COMMITTEE_DIRECT.search(urls))
@@ -37,60 +40,127 @@ def looks_like_direct_video_link(urls: str) -> bool:
 def is_generic_placeholder(urls: str) -> bool:
     return bool(RE_CSPAN_GENERIC.search(urls) or RE_OVERSIGHT_GENERIC.search(urls) or RE_REUTERS_GENERIC.search(urls))
 
-def build_sections(mt: List[Dict], pe: List[Dict]) -> Dict[str, List[List[str]]]:
-    cspan, sdny, media, oversight = [], [], [], []
-    deep_event, deep_people = [], []
-
-    for r in mt:
-        date, loc, event = r.get("date",""), r.get("location",""), r.get("event","")
-        srcs, notes = r.get("source_urls",""), r.get("notes","")
-
-        # C-SPAN pending
-        if "C-SPAN" in event.upper():
-            verified = "✅" if looks_like_direct_video_link(srcs) else "☐"
-            if verified == "☐" and (has_tbd(notes) or is_generic_placeholder(srcs) or not srcs):
-                cspan.append([event, date, loc, "TBD", verified, notes])
-
-        # SDNY Docket
-        if "SDNY DOCKET" in loc.upper() and ("ECF" in event.upper() or "UNSEAL" in event.upper()):
-            verified_link = "✅" if ("courtlistener.com/docket" in srcs and not has_tbd(notes)) else "☐"
-            if verified_link == "☐":
-                m = re.search(r"ECF\s*([0-9]+(?:\.[0-9]+)?)", event, re.I)
-                ecf = m.group(1) if m else "—"
-                sdny.append([ecf, event, date, verified_link, srcs or ""])
-
-        # Media sets
-        if any(tok in event for tok in ["Reuters","GETTY","Wire","wire","Wire:"]):
+def ecf_number(event: str) -> str:
+    m = RE_ECF.search(event)
+    return m.group(1) if m else "—"
+
+def deep_search_pending(status: str) -> bool:
+    return status.lower() in ("", "pending")
+
+def classify_master(r: MasterRow) -> Dict[str, List[str]]:
+    """
+    {section: entry} for one timeline row, routed to every section in a single pass: event and
+    location are upper-cased once, and each link / notes regex runs at most once, only when a
+    section needs it. Only unverified items are listed, so the "Verified" column is always ☐.
+    """
+    out: Dict[str, List[str]] = {}
+    date, loc, event, srcs, notes = r.date, r.location, r.event, r.source_urls, r.notes
+    ev_up, loc_up = event.upper(), loc.upper()
+    direct = tbd = generic = None
+
+    # C-SPAN pending
+    if "C-SPAN" in ev_up:
+        direct = looks_like_direct_video_link(srcs)
+        if not direct:
+            tbd, generic = has_tbd(notes), is_generic_placeholder(srcs)
+            if tbd or generic or not srcs:
+                out["cspan"] = [event, date, loc, "TBD", "☐", notes]
+
+    # SDNY Docket
+    if "SDNY DOCKET" in loc_up and ("ECF" in ev_up or "UNSEAL" in ev_up):
+        if tbd is None:
+            tbd = has_tbd(notes)
+        if not ("courtlistener.com/docket" in srcs and not tbd):
+            out["sdny"] = [ecf_number(event), event, date, "☐", srcs]
+
+    # Media sets
+    if any(tok in event for tok in MEDIA_TOKENS):
+        if generic is None:
             generic = is_generic_placeholder(srcs)
-            verified = "✅" if (srcs and not generic) else "☐"
-            if verified == "☐" and (has_tbd(notes) or generic or not srcs):
-                media.append([date, loc, event, "TBD", verified, notes])
+        if generic or not srcs:
+            out["media"] = [date, loc, event, "TBD", "☐", notes]
 
-        # House Oversight video
-        if "HOUSE OVERSIGHT" in loc.upper() and "VIDEO" in event.upper():
-            verified = "✅" if looks_like_direct_video_link(srcs) else "☐"
-            if verified == "☐":
-                oversight.append([date, event, "TBD", verified, notes])
+    # House Oversight video
+    if "HOUSE OVERSIGHT" in loc_up and "VIDEO" in ev_up:
+        if direct is None:
+            direct = looks_like_direct_video_link(srcs)
+        if not direct:
+            out["oversight"] = [date, event, "TBD", "☐", notes]
 
-        # Deep search tracker – events
-        dse = (r.get("deep_search_event","") or "").lower()
-        if not dse or dse == "pending":
-            deep_event.append([date, loc, event, r.get("participants_on_record",""), r.get("deep_search_notes","")])
+    # Deep search tracker – events
+    if deep_search_pending(r.deep_search_event):
+        out["deep_event"] = [date, loc, event, r.participants_on_record, r.deep_search_notes]
+    return out
 
+def classify_person(r: PeopleRow) -> Dict[str, List[str]]:
     # Deep search tracker – people at events
-    for r in pe:
-        dsp = (r.get("deep_search_person","") or "").lower()
-        if not dsp or dsp == "pending":
-            deep_people.append([r.get("date",""), r.get("location",""), r.get("event",""), r.get("person",""), r.get("role",""), r.get("deep_search_notes","")])
+    if deep_search_pending(r.deep_search_person):
+        return {"deep_people": [r.date, r.location, r.event, r.person, r.role, r.deep_search_notes]}
+    return {}
+
+def unverified_classifier(section: str, fields: Tuple[str, ...]) -> Callable[[object], Dict[str, List[str]]]:
+    """Unverified leads are listed (in file order) until their confidence is "verified"."""
+    def classify(r) -> Dict[str, List[str]]:
+        if r.confidence.lower() == "verified":
+            return {}
+        return {section: [getattr(r, f) for f in fields]}
+    return classify
+
+# (section, source dataset, heading, table headers); the document lists them in this order
+SECTIONS = [
+    ("cspan", "master_timeline", "🗓️ C-SPAN Segments Needing Program/Clip IDs",
+     ["Event Title","Date","Location","Program/Clip ID","Verified","Notes"]),
+    ("sdny", "master_timeline", "⚖️ CourtListener / SDNY Docket Items",
+     ["ECF #","Description","Date","Verified Link","Source"]),
+    ("media", "master_timeline", "📰 Getty / Reuters / Wire Photo Sets – Asset IDs Pending",
+     ["Date","Location","Set Title","Asset ID","Verified","Notes"]),
+    ("oversight", "master_timeline", "🏛️ House Oversight Video Clips – Direct URLs/IDs Pending",
+     ["Date","Title","Video ID/URL","Verified","Notes"]),
+    ("deep_event", "master_timeline", "🔎 Deep Searches Pending – Events",
+     ["Date","Location","Event","Participants (on record)","Search Notes"]),
+    ("deep_people", "verified_people_events", "🔎 Deep Searches Pending – People at Events",
+     ["Date","Location","Event","Person","Role","Search Notes"]),
+    ("unverified_events", "unverified_events", "🔸 Unverified Events – Awaiting Verification",
+     ["Date","Location","Event","Primary Source","Secondary Source","Confidence","Next Step"]),
+    ("unverified_people", "unverified_people", "🔸 Unverified People – Awaiting Cross-Confirmation",
+     ["Person","Possible Date","Location","Alleged Association","Source","Confidence","Next Step"]),
+    ("unverified_connections", "unverified_connections", "🔸 Unverified Connections – Leads Needing Validation",
+     ["Entity A","Entity B","Connection Type","Source","Confidence","Next Step"]),
+]
+SORTED_SECTIONS = {"cspan", "sdny", "media", "oversight", "deep_event", "deep_people"}
+
+# dataset -> date column for the per-year pages (connections have none: they all go on undated.md)
+DATE_FIELDS = {"master_timeline": "date", "verified_people_events": "date",
+               "unverified_events": "date", "unverified_people": "possible_event_date"}
+# Page names build_shards produces; only these are ever removed from the shard directory
+SHARD_PAGE_RE = re.compile(r"(?:%s|\d{4}|undated)(?:-\d+)?\.md" % "|".join(k for k, *_ in SECTIONS))
 
-    # sort sections
-    for lst in (cspan, sdny, media, oversight, deep_event, deep_people):
-        lst.sort(key=lambda x: tuple(str(s).lower() for s in x))
+# dataset -> (record class, row classifier)
+SOURCES = {
+    "master_timeline": (MasterRow, classify_master),
+    "verified_people_events": (PeopleRow, classify_person),
+    "unverified_events": (UnverifiedEvent, unverified_classifier("unverified_events",
+        ("date","location","event","primary_source","secondary_source","confidence","next_step"))),
+    "unverified_people": (UnverifiedPerson, unverified_classifier("unverified_people",
+        ("person","possible_event_date","location","alleged_association","source","confidence","next_step"))),
+    "unverified_connections": (UnverifiedConnection, unverified_classifier("unverified_connections",
+        ("entity_a","entity_b","connection_type","source","confidence","next_step"))),
+}
 
-    return {
-        "cspan": cspan, "sdny": sdny, "media": media, "oversight": oversight,
-        "deep_event": deep_event, "deep_people": deep_people
-    }
+def collect(entries: Iterable[Dict[str, List[str]]], keys: Iterable[str]) -> Dict[str, List[List[str]]]:
+    """Per-row entries -> section lists (timeline / people sections sorted, unverified in file order)."""
+    sections: Dict[str, List[List[str]]] = {k: [] for k in keys}
+    for e in entries:
+        for k, entry in e.items():
+            sections[k].append(entry)
+    for k, lst in sections.items():
+        if k in SORTED_SECTIONS:
+            lst.sort(key=lambda x: tuple(str(s).lower() for s in x))
+    return sections
+
+def build_sections(mt: List[MasterRow], pe: List[PeopleRow]) -> Dict[str, List[List[str]]]:
+    return collect(chain(map(classify_master, mt), map(classify_person, pe)),
+                   [k for k, src, _, _ in SECTIONS if src in ("master_timeline", "verified_people_events")])
 
 def render_table(headers, rows):
     if not rows: return "_All items resolved._\n"
@@ -98,51 +168,211 @@ def render_table(headers, rows):
     out += ["|"+"|".join(r)+"|" for r in rows]
     return "\n".join(out)+"\n"
 
-def compact_read(path: str, headers: list[str]) -> list[dict]:
-    p = DATA / path
-    if not p.exists(): return []
-    with p.open(newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    return [{k:(r.get(k,"") or "").strip() for k in headers} for r in rows]
+def load_rows(name: str, cls, conn=None) -> list:
+    if conn is None:
+        return read_records(DATA / f"{name}.csv", cls)
+    return [cls.from_mapping(r) for r in timeline_db.query(conn, name)]
 
-def main():
-    mt = read_csv(DATA / "master_timeline.csv", MT_FIELDS)
-    pe = read_csv(DATA / "verified_people_events.csv", PEOPLE_FIELDS)
-    sections = build_sections(mt, pe)
+def in_window(rows: list, date_from: str, date_to: str = None) -> list:
+    """Rows (in their original order) whose date span overlaps the window; undated rows are dropped."""
+    return [rows[i] for i in sorted(date_index.index_records(rows).overlap(date_from, date_to))]
 
+def render_doc(tables: Dict[str, str], note: str = "") -> str:
     md = []
     md.append("# FREE-DOM – Reference Completion Checklist (Auto-Generated)\n")
     md.append("Built each push. Items disappear once IDs/links are added or deep searches are marked done.\n")
+    if note:
+        md.append(note)
     md.append("---\n")
+    for i, (key, _, heading, _) in enumerate(SECTIONS):
+        md.append(("\n" if i else "") + f"## {heading}\n")
+        md.append(tables[key])
+    return "\n".join(md)
+
+def code_version() -> str:
+    """Fingerprint of the code that classifies and renders rows; a change invalidates the whole cache."""
+    here = pathlib.Path(__file__)
+    return text_digest("".join(file_sha256(here.with_name(n)) for n in (here.name, "records.py")))
 
-    md.append("## 🗓️ C-SPAN Segments Needing Program/Clip IDs\n")
-    md.append(render_table(["Event Title","Date","Location","Program/Clip ID","Verified","Notes"], sections["cspan"]))
-    md.append("\n## ⚖️ CourtListener / SDNY Docket Items\n")
-    md.append(render_table(["ECF #","Description","Date","Verified Link","Source"], sections["sdny"]))
-    md.append("\n## 📰 Getty / Reuters / Wire Photo Sets – Asset IDs Pending\n")
-    md.append(render_table(["Date","Location","Set Title","Asset ID","Verified","Notes"], sections["media"]))
-    md.append("\n## 🏛️ House Oversight Video Clips – Direct URLs/IDs Pending\n")
-    md.append(render_table(["Date","Title","Video ID/URL","Verified","Notes"], sections["oversight"]))
-
-    md.append("\n## 🔎 Deep Searches Pending – Events\n")
-    md.append(render_table(["Date","Location","Event","Participants (on record)","Search Notes"], sections["deep_event"]))
-    md.append("\n## 🔎 Deep Searches Pending – People at Events\n")
-    md.append(render_table(["Date","Location","Event","Person","Role","Search Notes"], sections["deep_people"]))
-
-    # Unverified sections
-    ue = [r for r in compact_read("unverified_events.csv", ["date","location","event","primary_source","secondary_source","confidence","notes","next_step"]) if r.get("confidence","").lower() != "verified"]
-    up = [r for r in compact_read("unverified_people.csv", ["person","possible_event_date","location","alleged_association","source","confidence","notes","next_step"]) if r.get("confidence","").lower() != "verified"]
-    uc = [r for r in compact_read("unverified_connections.csv", ["entity_a","entity_b","connection_type","source","confidence","notes","next_step"]) if r.get("confidence","").lower() != "verified"]
-
-    md.append("\n## 🔸 Unverified Events – Awaiting Verification\n")
-    md.append(render_table(["Date","Location","Event","Primary Source","Secondary Source","Confidence","Next Step"], [[r["date"], r["location"], r["event"], r["primary_source"], r["secondary_source"], r["confidence"], r["next_step"]] for r in ue]))
-    md.append("\n## 🔸 Unverified People – Awaiting Cross-Confirmation\n")
-    md.append(render_table(["Person","Possible Date","Location","Alleged Association","Source","Confidence","Next Step"], [[r["person"], r["possible_event_date"], r["location"], r["alleged_association"], r["source"], r["confidence"], r["next_step"]] for r in up]))
-    md.append("\n## 🔸 Unverified Connections – Leads Needing Validation\n")
-    md.append(render_table(["Entity A","Entity B","Connection Type","Source","Confidence","Next Step"], [[r["entity_a"], r["entity_b"], r["connection_type"], r["source"], r["confidence"], r["next_step"]] for r in uc]))
-
-    CHECKLIST.write_text("\n".join(md), encoding="utf-8")
-    print("Updated CHECKLIST.md")
+def build_incremental(out: pathlib.Path, load: Callable[[str, type], list], full: bool = False) -> Optional[bool]:
+    """
+    Rebuild `out` from cached per-section fragments, re-reading only datasets whose CSV changed and
+    re-classifying only rows not seen before. None when inputs, code and output all match the cache
+    (nothing is read or written); otherwise whether the file changed.
+    """
+    cache = {} if full else load_versioned(CHECKLIST_CACHE, CACHE_VERSION)
+    code = code_version()
+    if cache.get("code") != code:
+        cache = {}
+    shas = {name: file_sha256(DATA / f"{name}.csv") for name in SOURCES}
+    sources, fragments = cache.get("sources", {}), cache.get("fragments", {})
+    if (cache and cache.get("output") == str(out) and out.exists()
+            and all(sources.get(n, {}).get("sha256") == shas[n] for n in SOURCES)
+            and cache.get("output_sha256") == file_sha256(out)):
+        return None
+
+    for name, (cls, classify) in SOURCES.items():
+        keys = [k for k, src, _, _ in SECTIONS if src == name]
+        entry = sources.get(name)
+        if entry and entry["sha256"] == shas[name] and all(k in fragments for k in keys):
+            continue
+        old_rows = entry["rows"] if entry else {}
+        rows: Dict[str, Dict[str, List[str]]] = {}
+        per_row = []
+        for r in load(name, cls):
+            h = text_digest("\x1f".join(r.values()))[:16]
+            e = rows.get(h)
+            if e is None:
+                e = rows[h] = old_rows[h] if h in old_rows else classify(r)
+            per_row.append(e)
+        sections = collect(per_row, keys)
+        headers = {k: h for k, _, _, h in SECTIONS}
+        for k in keys:
+            fp = text_digest(json.dumps(sections[k], ensure_ascii=False))
+            if fragments.get(k, {}).get("fp") != fp:
+                fragments[k] = {"fp": fp, "table": render_table(headers[k], sections[k])}
+        sources[name] = {"sha256": shas[name], "rows": rows}
+
+    changed = write_text(out, render_doc({k: fragments[k]["table"] for k, _, _, _ in SECTIONS}))
+    write_text(CHECKLIST_CACHE, json.dumps({"version": CACHE_VERSION, "code": code, "output": str(out),
+                                            "output_sha256": file_sha256(out), "sources": sources,
+                                            "fragments": fragments}, ensure_ascii=False))
+    return changed
+
+def row_year(value: str) -> str:
+    span = parse_span((value or "").strip())
+    return str(span.start.year) if span else "undated"
+
+def render_shard_index(counts: Dict[str, int], year_counts: Dict[str, int]) -> str:
+    md = ["# FREE-DOM – Reference Completion Checklist (Auto-Generated)\n",
+          "One page per section and per year; a page is rewritten only when its content changes.\n",
+          "|Section|Open Items|", "|---|---|"]
+    md += [f"|[{heading}]({key}.md)|{counts[key]}|" for key, _, heading, _ in SECTIONS]
+    md += ["", "## By Year\n", "|Year|Open Items|", "|---|---|"]
+    md += [f"|[{y}]({y}.md)|{n}|" for y, n in year_counts.items()]
+    return "\n".join(md) + "\n"
+
+def paginate(stem: str, title: str, parts: List[Tuple[Optional[str], List[str], List[List[str]]]]) -> Dict[str, str]:
+    """(heading, table headers, rows) parts -> {file name: page}, at most PAGE_ROWS table rows per page."""
+    chunks, cur, size = [], [], 0
+    for heading, headers, rows in parts:
+        start = 0
+        while True:
+            if size >= PAGE_ROWS:
+                chunks.append(cur)
+                cur, size = [], 0
+            take = rows[start:start + PAGE_ROWS - size]
+            cur.append((heading, headers, take))
+            size, start = size + len(take), start + len(take)
+            if start >= len(rows):
+                break
+    chunks.append(cur)
+
+    names = [f"{stem}.md" if n == 1 else f"{stem}-{n}.md" for n in range(1, len(chunks) + 1)]
+    pages = {}
+    for n, chunk in enumerate(chunks):
+        nav = ["[← Checklist index](README.md)"]
+        if n:
+            nav.append(f"[← Previous]({names[n - 1]})")
+        if n + 1 < len(chunks):
+            nav.append(f"[Next →]({names[n + 1]})")
+        md = [f"# {title}" + (f" ({n + 1}/{len(chunks)})" if len(chunks) > 1 else "") + "\n", " · ".join(nav) + "\n"]
+        for heading, headers, rows in chunk:
+            md += ([f"## {heading}\n"] if heading else []) + [render_table(headers, rows)]
+        pages[names[n]] = "\n".join(md)
+    return pages
+
+def build_shards(out_dir: pathlib.Path, load: Callable[[str, type], list]) -> Tuple[List[str], List[str]]:
+    """
+    Write the checklist as pages under out_dir: README.md (per-section / per-year counts), <section>.md
+    and <year>.md (rows grouped by the year their date starts in; undated rows and connections on
+    undated.md), each split into PAGE_ROWS-row pages. Every page is rendered on its own and replaced
+    only if its bytes differ; generated pages (SHARD_PAGE_RE) no longer produced are removed, other
+    files in out_dir are left alone. Rows already classified in the section cache are not classified
+    again. Returns (changed, removed) page names.
+    """
+    cache = load_versioned(CHECKLIST_CACHE, CACHE_VERSION)
+    cached = cache.get("sources", {}) if cache.get("code") == code_version() else {}
+    sections: Dict[str, List[List[str]]] = {}
+    by_year: Dict[str, List[Dict[str, List[str]]]] = {}
+    for name, (cls, classify) in SOURCES.items():
+        old_rows, field, per_row = cached.get(name, {}).get("rows", {}), DATE_FIELDS.get(name), []
+        for r in load(name, cls):
+            h = text_digest("\x1f".join(r.values()))[:16]
+            e = old_rows[h] if h in old_rows else classify(r)
+            per_row.append(e)
+            if e:
+                by_year.setdefault(row_year(getattr(r, field)) if field else "undated", []).append(e)
+        sections.update(collect(per_row, [k for k, src, _, _ in SECTIONS if src == name]))
+
+    pages: Dict[str, str] = {}
+    for key, _, heading, headers in SECTIONS:
+        pages.update(paginate(key, heading, [(None, headers, sections[key])]))
+    year_counts = {}
+    for y in sorted(by_year, key=lambda y: (not y.isdigit(), y)):
+        year_sections = collect(by_year[y], [k for k, *_ in SECTIONS])
+        year_counts[y] = sum(map(len, year_sections.values()))
+        pages.update(paginate(y, f"Checklist – {y}", [(heading, headers, year_sections[key])
+                                                      for key, _, heading, headers in SECTIONS if year_sections[key]]))
+    pages["README.md"] = render_shard_index({k: len(v) for k, v in sections.items()}, year_counts)
+
+    changed = [n for n, text in pages.items() if write_text(out_dir / n, text)]
+    removed = sorted(p.name for p in out_dir.glob("*.md") if SHARD_PAGE_RE.fullmatch(p.name) and p.name not in pages)
+    for n in removed:
+        (out_dir / n).unlink()
+    return changed, removed
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build CHECKLIST.md from the canonical datasets.")
+    ap.add_argument("--db", action="store_true",
+                    help="read the datasets through the SQLite mirror (synced first) instead of parsing the CSVs")
+    ap.add_argument("--from", dest="date_from",
+                    help="only list timeline / people rows whose date overlaps this date (YYYY, YYYY-MM or YYYY-MM-DD)")
+    ap.add_argument("--to", dest="date_to", help="with --from: end of the date window (default: the --from period)")
+    ap.add_argument("--out", default=str(CHECKLIST), help="output file (default: CHECKLIST.md)")
+    ap.add_argument("--full", action="store_true",
+                    help=f"ignore the section cache ({CHECKLIST_CACHE.name}) and reclassify every row")
+    ap.add_argument("--shard", nargs="?", const=str(SHARD_DIR.relative_to(ROOT)), metavar="DIR",
+                    help="write an index page plus per-section and per-year pages under DIR "
+                         "(default: docs/checklist) instead of one file")
+    args = ap.parse_args(argv)
+    if args.date_to and not args.date_from:
+        ap.error("--to requires --from")
+    if args.shard and args.date_from:
+        ap.error("--shard builds the full checklist; it cannot be combined with --from")
+    out = pathlib.Path(args.out)
+
+    conns = []
+    def load(name: str, cls) -> list:
+        if args.db and not conns:
+            conns.append(timeline_db.connect())
+        return load_rows(name, cls, conns[0] if conns else None)
+
+    if args.shard:
+        shard_dir = pathlib.Path(args.shard)
+        changed, removed = build_shards(shard_dir if shard_dir.is_absolute() else ROOT / shard_dir, load)
+        print(f"{args.shard}: {len(changed)} page(s) updated, {len(removed)} removed")
+        return
+
+    if not args.date_from:
+        changed = build_incremental(out, load, full=args.full)
+        print(f"{out.name} up to date" if changed is None else f"Updated {out.name}")
+        return
+
+    # Date window: an ad-hoc view, built in full without the cache
+    mt, pe = load("master_timeline", MasterRow), load("verified_people_events", PeopleRow)
+    try:
+        mt, pe = in_window(mt, args.date_from, args.date_to), in_window(pe, args.date_from, args.date_to)
+    except ValueError as e:
+        ap.error(str(e))
+    sections = build_sections(mt, pe)
+    for name in ("unverified_events", "unverified_people", "unverified_connections"):
+        cls, classify = SOURCES[name]
+        sections.update(collect(map(classify, load(name, cls)), [name]))
+    note = (f"Timeline and people sections limited to dates overlapping {args.date_from}"
+            + (f" – {args.date_to}" if args.date_to else "") + ".\n")
+    write_text(out, render_doc({k: render_table(h, sections[k]) for k, _, _, h in SECTIONS}, note))
+    print(f"Updated {out.name}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Date-interval index over the dated datasets (master timeline, people at events, photo/video anchors).
+- Every row becomes the closed interval its date covers: "2019" is the whole year, "2019-07" the
+  month, "2019-07-06–2019-07-08" the full range (timeline_dates.parse_span), not just its first part
+- Intervals are kept sorted by start, with the maximum end of each implicit subtree alongside
+  (an augmented interval tree over a flat array), so overlap queries cost O(log n + hits)
+- Rows whose date does not parse are not indexed; they are counted in .undated
+
+CLI:
+  python scripts/date_index.py overlap 2019-07
+  python scripts/date_index.py overlap 2019-07 --to 2019-09 --dataset master_timeline
+  python scripts/date_index.py near 2019-07-06 --days 3
+"""
+
+from __future__ import annotations
+import argparse, bisect, csv, pathlib, sys
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from records import MasterRow, MediaAnchor, PeopleRow, Record, read_records
+from timeline_dates import DateSpan, parse_span
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DATA = ROOT / "data"
+
+class Source(NamedTuple):
+    csv: pathlib.Path
+    cls: type
+    place: str    # location column
+    summary: str  # what happened
+
+SOURCES: Dict[str, Source] = {
+    "master_timeline": Source(DATA / "master_timeline.csv", MasterRow, "location", "event"),
+    "verified_people_events": Source(DATA / "verified_people_events.csv", PeopleRow, "location", "event"),
+    "photo_video_anchors": Source(DATA / "photo_video_anchors.csv", MediaAnchor, "place", "what_is_documented"),
+}
+
+def window(date_from: str, date_to: Optional[str] = None, days: int = 0) -> Tuple[date, date]:
+    """[start of date_from, end of date_to (default: date_from)] widened by `days` on both sides."""
+    lo, hi = parse_span(date_from.strip()), parse_span((date_to or date_from).strip())
+    if lo is None or hi is None:
+        raise ValueError(f"not a timeline date: {date_from if lo is None else date_to}")
+    return date.fromordinal(lo.start.toordinal() - days), date.fromordinal(hi.end.toordinal() + days)
+
+class DateIndex:
+    """
+    add(span, item) any number of times, then query; the index is (re)built on the first
+    query after an add. overlapping() returns items in start-date order (ties: insertion order).
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[int, int, int, Any]] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.items: List[Any] = []
+        self.max_end: List[int] = []
+        self.undated = 0
+
+    def __len__(self) -> int:
+        return len(self.items) + len(self._pending)
+
+    def add(self, span: Optional[DateSpan], item: Any) -> None:
+        if span is None:
+            self.undated += 1
+            return
+        self._pending.append((span.start.toordinal(), span.end.toordinal(), len(self), item))
+
+    def add_value(self, value: str, item: Any) -> None:
+        self.add(parse_span((value or "").strip()), item)
+
+    def _build(self) -> None:
+        entries = sorted([(s, e, n, it) for n, (s, e, it) in enumerate(zip(self.starts, self.ends, self.items))]
+                         + self._pending, key=lambda t: (t[0], t[2]))
+        self._pending = []
+        self.starts = [t[0] for t in entries]
+        self.ends = [t[1] for t in entries]
+        self.items = [t[3] for t in entries]
+        # max_end[mid] covers the slice [lo, hi) whose midpoint is mid (the implicit tree's node)
+        self.max_end = list(self.ends)
+        def fill(lo: int, hi: int) -> int:
+            if lo >= hi:
+                return -1
+            mid = (lo + hi) // 2
+            self.max_end[mid] = max(self.ends[mid], fill(lo, mid), fill(mid + 1, hi))
+            return self.max_end[mid]
+        fill(0, len(entries))
+
+    def overlapping(self, lo: date, hi: date) -> List[Any]:
+        """Items whose interval shares at least one day with [lo, hi]."""
+        if self._pending:
+            self._build()
+        qlo, qhi = lo.toordinal(), hi.toordinal()
+        # Only intervals starting on or before qhi can overlap: search that prefix of the tree
+        limit = bisect.bisect_right(self.starts, qhi)
+        out: List[int] = []
+        stack = [(0, len(self.starts))]
+        while stack:
+            a, b = stack.pop()
+            if a >= b or a >= limit:
+                continue
+            mid = (a + b) // 2
+            if self.max_end[mid] < qlo:
+                continue
+            stack.append((mid + 1, b))
+            if mid < limit and self.ends[mid] >= qlo:
+                out.append(mid)
+            stack.append((a, mid))
+        out.sort()
+        return [self.items[i] for i in out]
+
+    def overlap(self, date_from: str, date_to: Optional[str] = None) -> List[Any]:
+        """Items overlapping a timeline date ("2019-07") or the range from date_from to date_to."""
+        return self.overlapping(*window(date_from, date_to))
+
+    def within(self, value: str, days: int) -> List[Any]:
+        """Items overlapping `value` widened by `days` days on each side."""
+        return self.overlapping(*window(value, days=days))
+
+def index_records(records: Iterable[Record], field: str = "date") -> DateIndex:
+    """Index of row positions (0-based, in the given order) by their `field` date."""
+    idx = DateIndex()
+    for i, r in enumerate(records):
+        idx.add_value(r.get(field, ""), i)
+    return idx
+
+def build(names: Optional[Iterable[str]] = None) -> Tuple[DateIndex, Dict[str, List[Record]]]:
+    """One index over the named sources (default: all); items are (dataset, row position) pairs."""
+    idx = DateIndex()
+    rows: Dict[str, List[Record]] = {}
+    for name in (names or SOURCES):
+        rows[name] = read_records(SOURCES[name].csv, SOURCES[name].cls)
+        for i, r in enumerate(rows[name]):
+            idx.add_value(r.get("date", ""), (name, i))
+    return idx, rows
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Range / overlap queries over the dated timeline datasets.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    o = sub.add_parser("overlap", help="rows whose date overlaps DATE (or DATE..--to)")
+    o.add_argument("date")
+    o.add_argument("--to")
+    n = sub.add_parser("near", help="rows within --days days of DATE")
+    n.add_argument("date")
+    n.add_argument("--days", type=int, default=7)
+    for p in (o, n):
+        p.add_argument("--dataset", action="append", choices=sorted(SOURCES), help="repeatable; default: all")
+    args = ap.parse_args(argv)
+
+    idx, rows = build(args.dataset)
+    try:
+        hits = idx.overlap(args.date, args.to) if args.cmd == "overlap" else idx.within(args.date, args.days)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    w = csv.writer(sys.stdout)
+    w.writerow(["dataset", "row", "date", "location", "event"])
+    for name, i in hits:
+        r, src = rows[name][i], SOURCES[name]
+        w.writerow([name, i, r.get("date", ""), r.get(src.place, ""), r.get(src.summary, "")])
+    print(f"{len(hits)} row(s); {idx.undated} undated row(s) not indexed", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
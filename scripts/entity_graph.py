@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Entity graph over people, organizations, events and unverified connections (data/entity_graph.json, not committed).
+- Nodes have normalized IDs: "Jeffrey Epstein (subject)", "jeffrey  epstein" and "Jeffrey Epstein" are one
+  entity; events are keyed by date + normalized title, so the same event in the master timeline and
+  the people file is one node
+- Edges: entity–event from participants_on_record (semicolon lists) and verified_people_events
+  (relation = role), entity–entity from unverified_connections (relation = connection_type);
+  organizations.csv marks its entities as organizations
+- Every edge keeps its provenance ("dataset:row"); neighbourhood and k-hop queries walk the
+  adjacency lists without touching the CSVs
+- The cache stores each source's extracted nodes/edges with the CSV checksum: update() re-reads only
+  sources whose CSV changed (import_pending --graph runs it after a merge)
+
+CLI:
+  python scripts/entity_graph.py build
+  python scripts/entity_graph.py neighbors "Prince Andrew"
+  python scripts/entity_graph.py hops "Prince Andrew" --k 2
+"""
+
+from __future__ import annotations
+import argparse, pathlib, re, unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from records import MasterRow, Organization, PeopleRow, UnverifiedConnection, read_records
+from source_cache import refresh
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DATA = ROOT / "data"
+GRAPH_PATH = DATA / "entity_graph.json"
+VERSION = 1
+
+SOURCES: Dict[str, pathlib.Path] = {
+    "master_timeline": DATA / "master_timeline.csv",
+    "verified_people_events": DATA / "verified_people_events.csv",
+    "unverified_connections": DATA / "unverified_connections.csv",
+    "organizations": DATA / "organizations.csv",
+}
+
+# A more specific kind wins when sources disagree about a node
+KIND_RANK = {"entity": 0, "organization": 1, "event": 2}
+
+QUALIFIER_RE = re.compile(r"\([^)]*\)")
+NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+def norm_name(name: str) -> str:
+    """Lowercase, accents folded, parenthetical qualifiers dropped, punctuation collapsed to spaces."""
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return NON_WORD_RE.sub(" ", QUALIFIER_RE.sub(" ", s).lower()).strip()
+
+def entity_id(name: str) -> str:
+    n = norm_name(name)
+    return f"entity:{n}" if n else ""
+
+def event_id(date: str, title: str) -> str:
+    return f"event:{(date or '').strip()}:{norm_name(title)}"
+
+def split_names(value: str) -> List[str]:
+    return [p.strip() for p in (value or "").split(";") if p.strip()]
+
+class Edge(NamedTuple):
+    a: str
+    b: str
+    relation: str
+    ref: str  # "dataset:row" (0-based data row)
+
+class Extract(NamedTuple):
+    nodes: Dict[str, Dict[str, str]]  # id -> {"label", "kind", ...}
+    edges: List[Edge]
+
+def _node(nodes: Dict[str, Dict[str, str]], nid: str, label: str, kind: str, **extra: str) -> None:
+    cur = nodes.get(nid)
+    if cur is None:
+        nodes[nid] = {"label": label, "kind": kind, **extra}
+    elif KIND_RANK[kind] > KIND_RANK[cur["kind"]]:
+        cur.update(kind=kind, **extra)
+
+def extract(name: str, path: pathlib.Path) -> Extract:
+    """Nodes and edges contributed by one source CSV (single pass)."""
+    nodes: Dict[str, Dict[str, str]] = {}
+    edges: List[Edge] = []
+    if name in ("master_timeline", "verified_people_events"):
+        cls = MasterRow if name == "master_timeline" else PeopleRow
+        for i, r in enumerate(read_records(path, cls)):
+            ev = event_id(r.date, r.event)
+            _node(nodes, ev, r.event, "event", date=r.date, location=r.location)
+            people = split_names(r.participants_on_record) if cls is MasterRow else [r.person]
+            for p in people:
+                pid = entity_id(p)
+                if pid:
+                    _node(nodes, pid, QUALIFIER_RE.sub("", p).strip() or p, "entity")
+                    edges.append(Edge(pid, ev, r.get("role", "") or "participant", f"{name}:{i}"))
+    elif name == "unverified_connections":
+        for i, r in enumerate(read_records(path, UnverifiedConnection)):
+            a, b = entity_id(r.entity_a), entity_id(r.entity_b)
+            if a and b and a != b:
+                _node(nodes, a, r.entity_a, "entity")
+                _node(nodes, b, r.entity_b, "entity")
+                edges.append(Edge(a, b, r.connection_type or "connection", f"{name}:{i}"))
+    elif name == "organizations":
+        for r in read_records(path, Organization):
+            oid = entity_id(r.entity_name)
+            if oid:
+                _node(nodes, oid, r.entity_name, "organization", type=r.type, jurisdiction=r.jurisdiction)
+    return Extract(nodes, edges)
+
+class EntityGraph:
+    """Merged view of per-source extracts; adj[node][neighbor] -> [(relation, ref), ...]."""
+
+    def __init__(self, parts: Dict[str, Extract]):
+        self.nodes: Dict[str, Dict[str, str]] = {}
+        self.adj: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+        for name in SOURCES:
+            part = parts.get(name)
+            if part is None:
+                continue
+            for nid, info in part.nodes.items():
+                _node(self.nodes, nid, **info)
+            for e in part.edges:
+                self.adj.setdefault(e.a, {}).setdefault(e.b, []).append((e.relation, e.ref))
+                self.adj.setdefault(e.b, {}).setdefault(e.a, []).append((e.relation, e.ref))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Node ID for an entity name (or an ID as printed by the CLI); None if unknown."""
+        if name in self.nodes:
+            return name
+        nid = entity_id(name)
+        return nid if nid in self.nodes else None
+
+    def label(self, nid: str) -> str:
+        return self.nodes.get(nid, {}).get("label", nid)
+
+    def neighbors(self, nid: str) -> Dict[str, List[Tuple[str, str]]]:
+        return self.adj.get(nid, {})
+
+    def khop(self, nid: str, k: int) -> Dict[str, int]:
+        """Nodes within k edges of nid (breadth-first), mapped to their distance; nid itself excluded."""
+        dist = {nid: 0}
+        queue = deque([nid])
+        while queue:
+            cur = queue.popleft()
+            if dist[cur] == k:
+                continue
+            for nb in self.adj.get(cur, {}):
+                if nb not in dist:
+                    dist[nb] = dist[cur] + 1
+                    queue.append(nb)
+        del dist[nid]
+        return dist
+
+    def events_of(self, name: str) -> List[str]:
+        nid = self.resolve(name)
+        return sorted(nb for nb in self.neighbors(nid) if self.nodes[nb]["kind"] == "event") if nid else []
+
+def _extract_entry(name: str, _old: Optional[dict]) -> dict:
+    part = extract(name, SOURCES[name])
+    return {"nodes": part.nodes, "edges": [list(e) for e in part.edges]}
+
+def update(path: pathlib.Path = GRAPH_PATH, names: Optional[Iterable[str]] = None) -> Tuple[EntityGraph, List[str]]:
+    """(graph, re-extracted source names); sources whose CSV checksum is unchanged come from the cache."""
+    cached, changed = refresh(path, VERSION, SOURCES, _extract_entry, force=names or ())
+    parts = {name: Extract(cached[name]["nodes"], [Edge(*e) for e in cached[name]["edges"]]) for name in SOURCES}
+    return EntityGraph(parts), changed
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Entity graph over people, organizations, events and connections.")
+    ap.add_argument("--graph", default=str(GRAPH_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="update the cached graph (only changed sources are re-read)")
+    n = sub.add_parser("neighbors", help="direct connections of an entity or event")
+    n.add_argument("name")
+    h = sub.add_parser("hops", help="everything within K edges (person–event–person is 2)")
+    h.add_argument("name")
+    h.add_argument("--k", type=int, default=2)
+    args = ap.parse_args(argv)
+
+    graph, changed = update(pathlib.Path(args.graph))
+    if args.cmd == "build":
+        edges = sum(map(len, graph.adj.values())) // 2
+        print(f"{len(graph)} nodes, {edges} edges; re-read: {', '.join(changed) or 'nothing'}")
+        return
+    nid = graph.resolve(args.name)
+    if nid is None:
+        raise SystemExit(f"unknown entity: {args.name}")
+    if args.cmd == "neighbors":
+        for nb, rels in sorted(graph.neighbors(nid).items()):
+            kinds = ", ".join(sorted({rel for rel, _ in rels}))
+            refs = " ".join(ref for _, ref in rels)
+            print(f"{graph.nodes[nb]['kind']:12} {graph.label(nb)} [{kinds}] {refs}")
+    else:
+        for nb, d in sorted(graph.khop(nid, args.k).items(), key=lambda t: (t[1], t[0])):
+            print(f"{d}  {graph.nodes[nb]['kind']:12} {graph.label(nb)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Concurrent fetch layer for the AI Search Agent.
+- Pulls every whitelisted URL at once (asyncio over a private thread pool running `requests`)
+- Bounded global concurrency + per-host connection limit
+- Polite per-host pacing: token bucket per host, Retry-After / 429 / 503 backoff,
+  requests interleaved across hosts so one slow domain can't hog the global slots
+- Overall deadline: sources that miss it come back empty instead of stalling the sweep
+- Optional HttpCache: conditional GETs, cached body reused on 304
+- Works against any base URL, so it can be pointed at a local stub HTTP server
+"""
+
+from __future__ import annotations
+import asyncio, time, urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from itertools import zip_longest
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache
+
+DEFAULT_USER_AGENT = "FREE-DOM-AI-Agent/1.0 (+public sources only)"
+DEFAULT_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+RETRY_STATUSES = (429, 503)
+MAX_RETRIES = 2
+BACKOFF_BASE = 2.0     # seconds; doubled per attempt when no Retry-After is given
+BACKOFF_CAP = 60.0
+
+@dataclass
+class HostPolicy:
+    rate_per_sec: float = 1.0   # sustained requests/second to one host
+    burst: int = 2              # requests allowed back-to-back before pacing kicks in
+    max_connections: int = 2
+
+class TokenBucket:
+    """Async token bucket; `penalize` blocks the host entirely (Retry-After / backoff)."""
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, delay: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    content_type: str = ""
+    encoding: str = ""
+    body: bytes = b""
+    error: str = ""
+    elapsed: float = 0.0
+    from_cache: bool = False
+    retry_after: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and not self.error
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+def host_of(url: str) -> str:
+    try:
+        return urllib.parse.urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+def retry_delay(retry_after: str, attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After (seconds or HTTP date) or exponential backoff."""
+    ra = (retry_after or "").strip()
+    if ra:
+        try:
+            return min(max(float(ra), 0.0), BACKOFF_CAP)
+        except ValueError:
+            try:
+                return min(max(parsedate_to_datetime(ra).timestamp() - time.time(), 0.0), BACKOFF_CAP)
+            except (TypeError, ValueError):
+                pass
+    return min(BACKOFF_BASE * (2 ** attempt), BACKOFF_CAP)
+
+def interleave_by_host(urls: List[str]) -> List[str]:
+    """Round-robin across hosts: a, b, c, a, b, a... instead of a, a, a, b, b, c."""
+    groups: Dict[str, List[str]] = {}
+    for u in urls:
+        groups.setdefault(host_of(u), []).append(u)
+    return [u for batch in zip_longest(*groups.values()) for u in batch if u is not None]
+
+def make_session(user_agent: str = DEFAULT_USER_AGENT, pool_size: int = 8) -> requests.Session:
+    s = requests.Session()
+    s.headers.update({"User-Agent": user_agent, "Accept": DEFAULT_ACCEPT})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+def _blocking_get(session: requests.Session, url: str, timeout: float,
+                  cache: Optional[HttpCache] = None) -> FetchResult:
+    start = time.monotonic()
+    headers = cache.conditional_headers(url) if cache else {}
+    try:
+        r = session.get(url, timeout=timeout, headers=headers)
+        if r.status_code == 304 and cache:
+            hit = cache.get(url)
+            if hit is not None:
+                cache.touch(url)
+                return FetchResult(
+                    url=url, status=200, content_type=hit.get("content_type",""),
+                    encoding=hit.get("encoding",""), body=hit["body"],
+                    elapsed=time.monotonic() - start, from_cache=True,
+                )
+        res = FetchResult(
+            url=url, status=r.status_code,
+            content_type=r.headers.get("content-type",""),
+            encoding=r.encoding or "", body=r.content,
+            elapsed=time.monotonic() - start,
+            retry_after=r.headers.get("retry-after",""),
+        )
+        if cache and res.status == 200:
+            cache.put(url, res.body, etag=r.headers.get("etag",""),
+                      last_modified=r.headers.get("last-modified",""),
+                      content_type=res.content_type, encoding=res.encoding)
+        return res
+    except Exception as e:
+        return FetchResult(url=url, error=f"{type(e).__name__}: {e}", elapsed=time.monotonic() - start)
+
+async def fetch_all_async(urls: List[str], concurrency: int = 8, per_host: int = 2,
+                          deadline: float = 120.0, timeout: float = 20.0,
+                          session: Optional[requests.Session] = None,
+                          cache: Optional[HttpCache] = None,
+                          host_policies: Optional[Dict[str, HostPolicy]] = None) -> Dict[str, FetchResult]:
+    """Fetch every URL concurrently; returns url -> FetchResult in input order (duplicates fetched once).
+
+    `host_policies` maps host -> HostPolicy; unlisted hosts get HostPolicy(max_connections=per_host).
+    """
+    unique = list(dict.fromkeys(u for u in urls if u))
+    if not unique:
+        return {}
+    session = session or make_session(pool_size=concurrency)
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+    global_sem = asyncio.Semaphore(concurrency)
+    policies = host_policies or {}
+    host_sems: Dict[str, asyncio.Semaphore] = {}
+    buckets: Dict[str, TokenBucket] = {}
+    for host in dict.fromkeys(host_of(u) for u in unique):
+        pol = policies.get(host) or HostPolicy(max_connections=per_host)
+        host_sems[host] = asyncio.Semaphore(max(pol.max_connections, 1))
+        buckets[host] = TokenBucket(pol.rate_per_sec, pol.burst)
+
+    async def one(url: str) -> FetchResult:
+        host = host_of(url)
+        for attempt in range(MAX_RETRIES + 1):
+            # host slot + pacing token first, so a throttled host never holds a global slot
+            async with host_sems[host]:
+                await buckets[host].acquire()
+                async with global_sem:
+                    res = await loop.run_in_executor(pool, _blocking_get, session, url, timeout, cache)
+            if res.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return res
+            buckets[host].penalize(retry_delay(res.retry_after, attempt))
+        return res
+
+    # Tasks queue on the global semaphore in creation order, so create them host-interleaved
+    tasks = {url: asyncio.ensure_future(one(url)) for url in interleave_by_host(unique)}
+    try:
+        await asyncio.wait(list(tasks.values()), timeout=deadline)
+    finally:
+        for t in tasks.values():
+            if not t.done():
+                t.cancel()
+        # Don't wait on stragglers still blocked in a socket read; their results are dropped.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    out: Dict[str, FetchResult] = {}
+    for url in unique:
+        t = tasks[url]
+        if t.done() and not t.cancelled() and t.exception() is None:
+            out[url] = t.result()
+        else:
+            out[url] = FetchResult(url=url, error="deadline exceeded")
+    return out
+
+def fetch_all(urls: List[str], **kwargs) -> Dict[str, FetchResult]:
+    return asyncio.run(fetch_all_async(urls, **kwargs))
+
+if __name__ == "__main__":
+    import sys
+    started = time.monotonic()
+    for url, res in fetch_all(sys.argv[1:]).items():
+        print(f"{res.status or '-':>3}{'*' if res.from_cache else ' '} {len(res.body):>8}B  {res.elapsed:6.2f}s  {url}  {res.error}")
+    print(f"wall: {time.monotonic() - started:.2f}s")
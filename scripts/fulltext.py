@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Persisted full-text index (BM25) over the master timeline, people at events and photo/video anchors
+(data/fulltext_index.json, not committed).
+- Each row is tokenized once per field: event, location, participants, notes, deep_search_notes,
+  source_urls (anchors: what_is_documented, place, people_on_record, scene_notes)
+- Tokens are [A-Za-z0-9] runs, lowercased: the same split search_agent uses for its row keywords,
+  so the agent can take a row's keywords from the stored token tables (tokens_for)
+- Ranking is BM25 over a field-weighted term frequency (event and participants count more than notes)
+- update() re-reads only datasets whose CSV checksum changed, and reuses the stored tokens of
+  rows whose content is unchanged (import_pending --fulltext runs it after a merge)
+
+CLI:
+  python scripts/fulltext.py build
+  python scripts/fulltext.py query "central park photographs" [--limit 20] [--dataset master_timeline]
+"""
+
+from __future__ import annotations
+import argparse, math, pathlib, re, time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from records import MasterRow, MediaAnchor, PeopleRow, read_records
+from source_cache import refresh, text_digest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DATA = ROOT / "data"
+INDEX_PATH = DATA / "fulltext_index.json"
+VERSION = 1
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+K1, B = 1.2, 0.75
+FIELD_WEIGHTS = {"event": 2.0, "participants": 1.5, "location": 1.0, "notes": 1.0,
+                 "deep_search_notes": 1.0, "source_urls": 0.5}
+
+class Source(NamedTuple):
+    csv: pathlib.Path
+    cls: type
+    fields: Dict[str, str]   # index field -> CSV column
+    key: Tuple[str, ...]     # columns identifying the row (search_agent / import_pending key)
+
+SOURCES: Dict[str, Source] = {
+    "master_timeline": Source(DATA / "master_timeline.csv", MasterRow,
+                              {"event": "event", "location": "location", "participants": "participants_on_record",
+                               "notes": "notes", "deep_search_notes": "deep_search_notes", "source_urls": "source_urls"},
+                              ("date", "location", "event")),
+    "verified_people_events": Source(DATA / "verified_people_events.csv", PeopleRow,
+                                     {"event": "event", "location": "location", "participants": "person",
+                                      "deep_search_notes": "deep_search_notes", "source_urls": "source_urls"},
+                                     ("date", "location", "event", "person")),
+    "photo_video_anchors": Source(DATA / "photo_video_anchors.csv", MediaAnchor,
+                                  {"event": "what_is_documented", "location": "place", "participants": "people_on_record",
+                                   "notes": "scene_notes", "source_urls": "source_urls"},
+                                  ("date", "place", "what_is_documented")),
+}
+
+def tokenize(text: str) -> List[str]:
+    return [t.lower() for t in TOKEN_RE.findall(text or "")]
+
+def row_key(name: str, row) -> str:
+    """Stable key for a row mapping (CSV record or pandas row dict) of the given dataset."""
+    return "\x1f".join(str(row.get(c, "")).strip() for c in SOURCES[name].key)
+
+def extract(name: str, old_docs: List[dict]) -> List[dict]:
+    """Docs for one dataset: {"h", "key", "date", "place", "title", "tokens": {field: [...]}} per row."""
+    src = SOURCES[name]
+    reuse = {d["h"]: d["tokens"] for d in old_docs}
+    docs = []
+    for r in read_records(src.csv, src.cls):
+        h = text_digest("\x1f".join(r.values()))[:16]
+        tokens = reuse.get(h)
+        if tokens is None:
+            tokens = {f: tokenize(r.get(col, "")) for f, col in src.fields.items()}
+        docs.append({"h": h, "key": row_key(name, r), "date": r.get("date", ""),
+                     "place": r.get(src.fields["location"], ""), "title": r.get(src.fields["event"], ""),
+                     "tokens": tokens})
+    return docs
+
+class Hit(NamedTuple):
+    score: float
+    dataset: str
+    row: int
+    date: str
+    place: str
+    title: str
+
+class FullTextIndex:
+    def __init__(self, datasets: Dict[str, List[dict]]):
+        self.datasets = datasets
+        self.docs: List[Tuple[str, int]] = []
+        self.lengths: List[float] = []
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._by_key: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+        for name, docs in datasets.items():
+            for row, d in enumerate(docs):
+                n = len(self.docs)
+                self.docs.append((name, row))
+                self._by_key.setdefault((name, d["key"]), d["tokens"])
+                tf: Dict[str, float] = {}
+                for field, toks in d["tokens"].items():
+                    w = FIELD_WEIGHTS[field]
+                    for t in toks:
+                        tf[t] = tf.get(t, 0.0) + w
+                self.lengths.append(sum(tf.values()))
+                for t, f in tf.items():
+                    self.postings.setdefault(t, []).append((n, f))
+        self.avg_len = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.docs) - n + 0.5) / (n + 0.5))
+
+    def search(self, text: str, limit: int = 20, datasets: Optional[Iterable[str]] = None) -> List[Hit]:
+        """Rows ranked by BM25 for the query's tokens (any token may match), best first."""
+        allowed = set(datasets) if datasets else None
+        scores: Dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(text)):
+            idf = self.idf(term)
+            for n, f in self.postings.get(term, ()):
+                norm = K1 * (1 - B + B * self.lengths[n] / self.avg_len)
+                scores[n] = scores.get(n, 0.0) + idf * f * (K1 + 1) / (f + norm)
+        ranked = sorted(((s, n) for n, s in scores.items() if allowed is None or self.docs[n][0] in allowed),
+                        key=lambda t: (-t[0], t[1]))[:limit]
+        out = []
+        for s, n in ranked:
+            name, row = self.docs[n]
+            d = self.datasets[name][row]
+            out.append(Hit(round(s, 4), name, row, d["date"], d["place"], d["title"]))
+        return out
+
+    def tokens_for(self, name: str, row) -> Optional[Dict[str, List[str]]]:
+        """Stored token table of the row with the same key, or None if the index has no such row."""
+        return self._by_key.get((name, row_key(name, row)))
+
+def update(path: pathlib.Path = INDEX_PATH) -> Tuple[FullTextIndex, List[str]]:
+    """(index, re-read dataset names); datasets whose CSV checksum is unchanged come from the cache."""
+    cached, changed = refresh(path, VERSION, {name: src.csv for name, src in SOURCES.items()},
+                              lambda name, entry: {"docs": extract(name, entry["docs"] if entry else [])},
+                              key="datasets")
+    return FullTextIndex({name: cached[name]["docs"] for name in SOURCES}), changed
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Full-text (BM25) search over the timeline datasets.")
+    ap.add_argument("--index", default=str(INDEX_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="update the persisted index (only changed datasets are re-read)")
+    q = sub.add_parser("query")
+    q.add_argument("text")
+    q.add_argument("--limit", type=int, default=20)
+    q.add_argument("--dataset", action="append", choices=sorted(SOURCES), help="repeatable; default: all")
+    args = ap.parse_args(argv)
+
+    t = time.perf_counter()
+    index, changed = update(pathlib.Path(args.index))
+    if args.cmd == "build":
+        print(f"{len(index)} rows, {len(index.postings)} terms; re-read: {', '.join(changed) or 'nothing'}")
+        return
+    t_load = time.perf_counter() - t
+    t = time.perf_counter()
+    hits = index.search(args.text, args.limit, args.dataset)
+    t_query = time.perf_counter() - t
+    for h in hits:
+        print(f"{h.score:8.3f}  {h.dataset}:{h.row}  {h.date}  {h.place}  {h.title}")
+    print(f"{len(hits)} hit(s); load {t_load * 1000:.0f} ms, query {t_query * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk HTTP cache for the OSINT sweep (data/cache/http/).
+- Keyed by URL; stores body + ETag/Last-Modified + fetch time
+- Supplies conditional-GET headers and serves the cached body on 304
+- Bodies are written atomically (temp file + os.replace), so a crash or a late worker write never
+  leaves a partial body; a body whose size does not match its index entry is treated as missing
+  (no conditional headers, no cached copy)
+- Evicts entries older than max_age and, oldest first, anything over max_bytes
+"""
+
+from __future__ import annotations
+import json, hashlib, pathlib, threading, time
+from typing import Dict, Optional
+
+from atomic_csv import AtomicWrite
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / "data" / "cache" / "http"
+
+DEFAULT_MAX_AGE = 14 * 24 * 3600       # drop entries not refreshed for two weeks
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024   # total body budget
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8", errors="ignore")).hexdigest()[:24]
+
+class HttpCache:
+    def __init__(self, root: pathlib.Path = CACHE_DIR, max_age: float = DEFAULT_MAX_AGE,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.index_path = root / "index.json"
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            try:
+                self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except Exception:
+                self.index = {}
+
+    def _body_path(self, url: str) -> pathlib.Path:
+        return self.root / f"{url_key(url)}.body"
+
+    def _body_matches(self, url: str, meta: Dict) -> bool:
+        try:
+            return self._body_path(url).stat().st_size == meta.get("size")
+        except OSError:
+            return False
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        meta = self.index.get(url)
+        if not meta or not self._body_matches(url, meta):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Cached entry as {meta..., "body": bytes}, or None when missing/unreadable."""
+        meta = self.index.get(url)
+        if not meta:
+            return None
+        try:
+            body = self._body_path(url).read_bytes()
+        except OSError:
+            return None
+        if len(body) != meta.get("size"):
+            return None
+        return {**meta, "body": body}
+
+    def put(self, url: str, body: bytes, etag: str = "", last_modified: str = "",
+            content_type: str = "", encoding: str = "") -> None:
+        with AtomicWrite(self._body_path(url), mode="wb") as f:
+            f.write(body)
+        with self._lock:
+            self.index[url] = {
+                "etag": etag, "last_modified": last_modified,
+                "content_type": content_type, "encoding": encoding,
+                "fetched_at": time.time(), "size": len(body),
+            }
+
+    def touch(self, url: str) -> None:
+        """Mark a 304-revalidated entry as fresh."""
+        with self._lock:
+            if url in self.index:
+                self.index[url]["fetched_at"] = time.time()
+
+    def evict(self) -> int:
+        now = time.time()
+        with self._lock:
+            drop = [u for u, m in self.index.items() if now - m.get("fetched_at", 0) > self.max_age]
+            expired = set(drop)
+            keep = sorted((u for u in self.index if u not in expired),
+                          key=lambda u: self.index[u].get("fetched_at", 0), reverse=True)
+            total = 0
+            for u in keep:
+                total += self.index[u].get("size", 0)
+                if total > self.max_bytes:
+                    drop.append(u)
+            for u in drop:
+                self.index.pop(u, None)
+                self._body_path(u).unlink(missing_ok=True)
+        return len(drop)
+
+    def save(self) -> None:
+        self.evict()
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(self.index, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.index_path)
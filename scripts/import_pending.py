@@ -1,8 +1,22 @@
 #!/usr/bin/env python3
 from __future__ import annotations
+import argparse
 import csv
 import pathlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Iterable, Iterator, NamedTuple
+
+from atomic_csv import AtomicWrite, write_rows
+import entity_graph
+import fulltext
+import snapshots
+from key_index import KeyIndex
+from near_dupes import NearDupIndex
+import timeline_db
+from records import MasterRow, PeopleRow, UnverifiedConnection, UnverifiedEvent, UnverifiedPerson, read_records
+from timeline_dates import parse_date_key, parse_span
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
@@ -11,6 +25,8 @@ ARCHIVE = DATA / "archive"
 MASTER = DATA / "master_timeline.csv"
 PEOPLE = DATA / "verified_people_events.csv"
 
+HELD_NEAR_DUPES = DATA / "held_near_duplicates.csv"
+
 UNVER_EVENTS = DATA / "unverified_events.csv"
 UNVER_PEOPLE = DATA / "unverified_people.csv"
 UNVER_CONN = DATA / "unverified_connections.csv"
@@ -18,6 +34,7 @@ UNVER_CONN = DATA / "unverified_connections.csv"
 REQ_MASTER = ["date","location","event","participants_on_record","source_urls","notes"]
 OPT_MASTER = ["deep_search_event","deep_search_notes"]
 ALL_MASTER = REQ_MASTER + OPT_MASTER
+HELD_EXTRA = ["near_duplicate_of","similarity"]
 
 REQ_PEOPLE = ["date","location","event","person","role","source_urls","deep_search_person","deep_search_notes"]
 
@@ -25,141 +42,259 @@ REQ_UNVER_EVENTS = ["date","location","event","primary_source","secondary_source
 REQ_UNVER_PEOPLE = ["person","possible_event_date","location","alleged_association","source","confidence","notes","next_step"]
 REQ_UNVER_CONN = ["entity_a","entity_b","connection_type","source","confidence","notes","next_step"]
 
+PENDING_GLOBS = {"master": "pending_updates_*.csv", "people": "pending_people_*.csv", "unverified": "pending_unverified_*.csv"}
+PENDING_REQUIRED = {"master": REQ_MASTER, "people": REQ_PEOPLE, "unverified": ["type"]}
+MAX_ERRORS_PER_FILE = 20
+
+class Batch(NamedTuple):
+    kind: str
+    path: pathlib.Path
+    rows: list
+    errors: list
+
 def read_csv(path: pathlib.Path) -> list[dict]:
-    if not path.exists(): return []
+    return list(iter_csv(path))
+
+def iter_csv(path: pathlib.Path) -> Iterator[dict]:
+    if not path.exists(): return
     with path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+        yield from csv.DictReader(f)
 
-def write_csv(path: pathlib.Path, rows: list[dict], headers: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader()
-        for r in rows:
-            w.writerow({h: r.get(h,"") for h in headers})
+def write_csv(path: pathlib.Path, rows: Iterable[dict], headers: list[str]) -> bool:
+    return write_rows(path, headers, rows)
 
 def ensure_file(path: pathlib.Path, headers: list[str]) -> None:
     if not path.exists():
         write_csv(path, [], headers)
 
-def normalize_master_row(r: dict) -> dict:
-    out = {}
-    for k in ALL_MASTER:
-        v = (r.get(k,"") or "").strip()
-        if k in ("location","event"):
-            v = " ".join(v.split())
-        out[k] = v
-    if not out.get("deep_search_event"):
-        out["deep_search_event"] = "pending"
+def normalize_master_row(r: dict) -> MasterRow:
+    out = MasterRow.from_mapping(r)
+    out.location = sys.intern(" ".join(out.location.split()))
+    out.event = " ".join(out.event.split())
+    if not out.deep_search_event:
+        out.deep_search_event = "pending"
     return out
 
 def key_master(r: dict) -> tuple:
     return (r.get("date","").strip(), r.get("location","").strip(), r.get("event","").strip())
 
-def parse_date_key(d: str) -> tuple:
-    if "–" in d:
-        d = d.split("–",1)[0].strip()
-    for fmt in ("%Y-%m-%d","%Y-%m","%Y"):
-        try:
-            dt = datetime.strptime(d, fmt)
-            return (0, dt.year, dt.month if fmt != "%Y" else 1, dt.day if fmt == "%Y-%m-%d" else 1, d)
-        except ValueError:
-            pass
-    return (1, 9999, 12, 31, d or "~")
-
-def merge_master():
-    ensure_file(MASTER, ALL_MASTER)
-    master_rows = read_csv(MASTER)
+def master_sort_key(r: dict) -> tuple:
+    return (parse_date_key(r["date"]), r["location"].lower(), r["event"].lower())
+
+def master_key_index(load: bool = True) -> KeyIndex:
+    return KeyIndex(MASTER, lambda r: key_master(normalize_master_row(r)), load=load)
+
+def people_key_index(load: bool = True) -> KeyIndex:
+    return KeyIndex(PEOPLE, lambda r: key_people(normalize_people_row(r)), load=load)
+
+def merge_master_full(new_rows: list[dict]) -> None:
     merged, seen = [], set()
-    for r in master_rows:
-        for k in OPT_MASTER:
-            r.setdefault(k, "")
+    for r in iter_csv(MASTER):
         nr = normalize_master_row(r); k = key_master(nr)
         if k not in seen:
             merged.append(nr); seen.add(k)
 
-    for p in sorted(DATA.glob("pending_updates_*.csv")):
-        chunk = read_csv(p)
-        if not chunk: continue
-        for r in chunk:
-            for k in OPT_MASTER:
-                r.setdefault(k, "")
-            nr = normalize_master_row(r); k = key_master(nr)
-            if k not in seen:
-                merged.append(nr); seen.add(k)
+    for nr in new_rows:
+        k = key_master(nr)
+        if k not in seen:
+            merged.append(nr); seen.add(k)
 
-    merged.sort(key=lambda r: (parse_date_key(r["date"]), r["location"].lower(), r["event"].lower()))
+    merged.sort(key=master_sort_key)
     write_csv(MASTER, merged, ALL_MASTER)
-    return [p for p in sorted(DATA.glob("pending_updates_*.csv"))]
-
-def normalize_people_row(r: dict) -> dict:
-    out = {}
-    for k in REQ_PEOPLE:
-        out[k] = (r.get(k,"") or "").strip()
-    if not out.get("deep_search_person"):
-        out["deep_search_person"] = "pending"
+    index = master_key_index(load=False)
+    index.reset(seen)
+    index.save()
+
+def merge_master_incremental(new_rows: list[dict]) -> bool:
+    """Stream-merge the sorted new rows into the canonical file, treated as an already-sorted run.
+
+    Canonical rows are never re-normalized: rows before the first insertion point are only
+    keyed to find it, rows after the last one are copied as-is. Returns False (nothing
+    written) when the canonical file is not a sorted run in ALL_MASTER layout; the caller
+    then falls back to a full merge.
+    """
+    # Sidecar key index: rows already in the canonical file are dropped without parsing it
+    index = master_key_index()
+    new, seen_new = [], set()
+    for nr in new_rows:
+        k = key_master(nr)
+        if k not in seen_new and k not in index:
+            new.append(nr); seen_new.add(k)
+    if not new:
+        return True
+    new.sort(key=master_sort_key)
+    new_keys = [master_sort_key(r) for r in new]
+
+    out = AtomicWrite(MASTER)
+    ok = True
+    with MASTER.open(newline="", encoding="utf-8") as src, out as dst:
+        reader, w = csv.reader(src), csv.writer(dst)
+        if next(reader, None) != ALL_MASTER:
+            ok = False
+        else:
+            w.writerow(ALL_MASTER)
+            i, prev = 0, None
+            group_key, group = None, set()  # canonical keys sharing the current sort key (dedup window)
+
+            def emit_new_below(limit):
+                nonlocal i
+                while i < len(new) and (limit is None or new_keys[i] < limit):
+                    # ties sort canonical-first, so every canonical row with this sort key is already in `group`
+                    if not (new_keys[i] == group_key and key_master(new[i]) in group):
+                        w.writerow(new[i].values())
+                    i += 1
+
+            for raw in reader:
+                if i == len(new):
+                    w.writerow(raw)
+                    continue
+                if len(raw) != len(ALL_MASTER):
+                    ok = False; break
+                r = MasterRow(*raw)
+                sk = master_sort_key(r)
+                if prev is not None and sk < prev:
+                    ok = False; break
+                prev = sk
+                emit_new_below(sk)
+                if sk != group_key:
+                    group_key, group = sk, set()
+                group.add(key_master(r))
+                w.writerow(raw)
+            if ok:
+                emit_new_below(None)
+        if not ok:
+            out.discard()
+    if not ok:
+        return False
+    for k in seen_new:
+        index.add(k)
+    index.save()
+    return True
+
+def near_dup_text(r: dict) -> str:
+    return f"{r['event']} {r['location']}"
+
+def dates_overlap(a: str, b: str) -> bool:
+    sa, sb = parse_span(a), parse_span(b)
+    if sa is None or sb is None:
+        return a == b
+    return sa.start <= sb.end and sb.start <= sa.end
+
+def screen_near_dupes(new_rows: list[dict], hold: bool = False) -> list[dict]:
+    """Report pending master rows that look like rewordings of a known row (same or overlapping date).
+
+    With hold=True they are not merged but appended to HELD_NEAR_DUPES for review; to accept
+    one, move it into a pending_updates_*.csv batch and re-run with --near-dupes report.
+    """
+    if not new_rows:
+        return new_rows
+    # Exact duplicates (per the .keys sidecar) are dropped by the merge anyway; the canonical file
+    # is only parsed and MinHashed when some row is actually new
+    keys = master_key_index()
+    if all(key_master(nr) in keys for nr in new_rows):
+        return new_rows
+    index = NearDupIndex()
+    for r in iter_csv(MASTER):
+        nr = normalize_master_row(r)
+        index.add(nr, near_dup_text(nr))
+    kept, held, known = [], [], set()
+    for nr in new_rows:
+        k = key_master(nr)
+        if k in keys or k in known:  # exact duplicate: the merge drops it anyway
+            kept.append(nr); continue
+        match = next(((m, score) for m, score in index.query(near_dup_text(nr))
+                      if dates_overlap(m["date"], nr["date"])), None)
+        if match is not None:
+            m, score = match
+            print(f"::warning ::near-duplicate ({score:.2f}): {nr['date']} | {nr['event']} ~ {m['date']} | {m['event']}")
+            if hold:
+                held.append({**nr, "near_duplicate_of": " | ".join(key_master(m)), "similarity": f"{score:.2f}"})
+                continue
+        kept.append(nr); known.add(k); index.add(nr, near_dup_text(nr))
+
+    if held:
+        rows, seen = [], set()
+        for r in read_csv(HELD_NEAR_DUPES) + held:
+            k = key_master(r)
+            if k not in seen:
+                rows.append(r); seen.add(k)
+        write_csv(HELD_NEAR_DUPES, rows, ALL_MASTER + HELD_EXTRA)
+        print(f"Held {len(held)} near-duplicate row(s) in {HELD_NEAR_DUPES.name}")
+    return kept
+
+def merge_master(batches: list[Batch], incremental: bool = False, near_dupes: str = "off"):
+    ensure_file(MASTER, ALL_MASTER)
+    new_rows = [r for b in batches for r in b.rows]
+    if near_dupes != "off":
+        new_rows = screen_near_dupes(new_rows, hold=(near_dupes == "hold"))
+    if not (incremental and merge_master_incremental(new_rows)):
+        merge_master_full(new_rows)
+    return [b.path for b in batches]
+
+def normalize_people_row(r: dict) -> PeopleRow:
+    out = PeopleRow.from_mapping(r)
+    if not out.deep_search_person:
+        out.deep_search_person = "pending"
     return out
 
 def key_people(r: dict) -> tuple:
     return (r.get("date","").strip(), r.get("location","").strip(), r.get("event","").strip(), r.get("person","").strip())
 
-def merge_people():
+def merge_people(batches: list[Batch], incremental: bool = False):
     ensure_file(PEOPLE, REQ_PEOPLE)
-    existing = read_csv(PEOPLE)
+    pendings = [b.path for b in batches if b.rows]
+    incoming = [r for b in batches for r in b.rows]
+
+    # Nothing new per the sidecar key index: leave the canonical file untouched (and unparsed)
+    if incremental:
+        index = people_key_index()
+        if all(key_people(nr) in index for nr in incoming):
+            return pendings
+
     merged, seen = [], set()
-    for r in existing:
+    for r in iter_csv(PEOPLE):
         nr = normalize_people_row(r); k = key_people(nr)
         if k not in seen:
             merged.append(nr); seen.add(k)
-
-    pendings = []
-    for p in sorted(DATA.glob("pending_people_*.csv")):
-        chunk = read_csv(p)
-        if not chunk: continue
-        pendings.append(p)
-        if any(h not in chunk[0].keys() for h in REQ_PEOPLE):
-            raise SystemExit(f"{p.name} missing required headers")
-        for r in chunk:
-            nr = normalize_people_row(r); k = key_people(nr)
-            if k not in seen:
-                merged.append(nr); seen.add(k)
+    for nr in incoming:
+        k = key_people(nr)
+        if k not in seen:
+            merged.append(nr); seen.add(k)
 
     merged.sort(key=lambda r: (parse_date_key(r["date"]), r["location"].lower(), r["event"].lower(), r["person"].lower()))
     write_csv(PEOPLE, merged, REQ_PEOPLE)
+    index = people_key_index(load=False)
+    index.reset(seen)
+    index.save()
     return pendings
 
-def merge_unverified():
+def merge_unverified(batches: list[Batch]):
     ensure_file(UNVER_EVENTS, REQ_UNVER_EVENTS)
     ensure_file(UNVER_PEOPLE, REQ_UNVER_PEOPLE)
     ensure_file(UNVER_CONN, REQ_UNVER_CONN)
 
-    ue = read_csv(UNVER_EVENTS); up = read_csv(UNVER_PEOPLE); uc = read_csv(UNVER_CONN)
+    ue = read_records(UNVER_EVENTS, UnverifiedEvent)
+    up = read_records(UNVER_PEOPLE, UnverifiedPerson)
+    uc = read_records(UNVER_CONN, UnverifiedConnection)
 
-    def dedupe(existing, headers):
+    def dedupe(existing):
         seen_local = set(); out = []
         for r in existing:
-            key = tuple((r.get(h,"") or "").strip() for h in headers)
+            key = tuple(r.values())
             if key not in seen_local:
-                out.append({h: r.get(h,"") for h in headers}); seen_local.add(key)
+                out.append(r); seen_local.add(key)
         return out
 
-    pendings = []
-    for p in sorted(DATA.glob("pending_unverified_*.csv")):
-        rows = read_csv(p)
-        if not rows: continue
-        pendings.append(p)
-        for r in rows:
-            t = (r.get("type","") or "").strip().lower()
-            if t == "event":
-                item = {h: (r.get(h,"") or "").strip() for h in REQ_UNVER_EVENTS}; ue.append(item)
-            elif t == "person":
-                item = {h: (r.get(h,"") or "").strip() for h in REQ_UNVER_PEOPLE}; up.append(item)
-            elif t == "connection":
-                item = {h: (r.get(h,"") or "").strip() for h in REQ_UNVER_CONN}; uc.append(item)
-
-    ue = dedupe(ue, REQ_UNVER_EVENTS)
-    up = dedupe(up, REQ_UNVER_PEOPLE)
-    uc = dedupe(uc, REQ_UNVER_CONN)
+    pendings = [b.path for b in batches if b.rows]
+    targets = {"event": ue, "person": up, "connection": uc}
+    for b in batches:
+        for t, item in b.rows:
+            if t in targets:  # rows of any other type are ignored
+                targets[t].append(item)
+
+    ue = dedupe(ue)
+    up = dedupe(up)
+    uc = dedupe(uc)
 
     ue.sort(key=lambda r: (r["date"].lower(), r["location"].lower(), r["event"].lower()))
     up.sort(key=lambda r: (r["possible_event_date"].lower(), r["location"].lower(), r["person"].lower()))
@@ -170,6 +305,71 @@ def merge_unverified():
     write_csv(UNVER_CONN, uc, REQ_UNVER_CONN)
     return pendings
 
+def normalize_unverified_row(r: dict) -> tuple:
+    t = (r.get("type","") or "").strip().lower()
+    cls = {"event": UnverifiedEvent, "person": UnverifiedPerson, "connection": UnverifiedConnection}.get(t)
+    return t, (cls.from_mapping(r) if cls else None)
+
+def ingest_batch(kind: str, path: pathlib.Path) -> Batch:
+    """Parse, validate and normalize one pending file (runs in a worker process with --workers)."""
+    try:
+        with path.open(newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            raw = [(reader.line_num, r) for r in reader]
+            fields = reader.fieldnames or []
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        return Batch(kind, path, [], [f"unreadable: {e}"])
+    if not raw:
+        return Batch(kind, path, [], [])
+
+    errors = []
+    missing = [h for h in PENDING_REQUIRED[kind] if h not in fields]
+    if missing:
+        errors.append(f"missing required headers {missing}")
+    for line, r in raw:
+        if None in r:
+            errors.append(f"line {line}: {len(fields) + len(r[None])} fields, header has {len(fields)}")
+        elif None in r.values():
+            errors.append(f"line {line}: {sum(v is not None for v in r.values())} fields, header has {len(fields)}")
+    if errors:
+        if len(errors) > MAX_ERRORS_PER_FILE:
+            errors[MAX_ERRORS_PER_FILE:] = [f"... {len(errors) - MAX_ERRORS_PER_FILE} more"]
+        return Batch(kind, path, [], errors)
+
+    if kind == "master":
+        rows = [normalize_master_row(r) for _, r in raw]
+    elif kind == "people":
+        rows = [normalize_people_row(r) for _, r in raw]
+    else:
+        rows = [normalize_unverified_row(r) for _, r in raw]
+    return Batch(kind, path, rows, [])
+
+def ingest_pending(workers: int = 1) -> tuple[dict[str, list[Batch]], list[Batch]]:
+    """All pending files parsed and validated, optionally on a process pool.
+
+    Returns (valid batches per kind in file order, failed batches). Failed files are not
+    merged or archived; the caller reports them together.
+    """
+    jobs = [(kind, p) for kind, pattern in PENDING_GLOBS.items() for p in sorted(DATA.glob(pattern))]
+    if workers <= 1 or len(jobs) < 2:
+        results = [ingest_batch(kind, p) for kind, p in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(ingest_batch, *zip(*jobs)))
+    valid: dict[str, list[Batch]] = {kind: [] for kind in PENDING_GLOBS}
+    failed = []
+    for b in results:
+        (failed if b.errors else valid[b.kind]).append(b)
+    return valid, failed
+
+def report_failures(failed: list[Batch]) -> None:
+    for b in failed:
+        for msg in b.errors:
+            print(f"::error ::{b.path.name}: {msg}")
+    if failed:
+        print(f"{len(failed)} pending file(s) failed validation and were left in place: "
+              + ", ".join(b.path.name for b in failed))
+
 def archive(files):
     ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     for p in files:
@@ -177,11 +377,49 @@ def archive(files):
         p.replace(ARCHIVE / f"{p.stem}.processed_{ts}.csv")
 
 def main():
+    ap = argparse.ArgumentParser(description="Merge pending batches into the canonical datasets.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="stream-merge new master rows into the sorted canonical file instead of reloading and re-sorting it; "
+                         "skip canonical rewrites when the .keys sidecars show no new rows")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="parse and validate pending files on N processes")
+    ap.add_argument("--near-dupes", choices=["off","report","hold"], default="off",
+                    help="check new master rows for reworded duplicates (MinHash/LSH): warn only, or also hold "
+                         f"them back in {HELD_NEAR_DUPES.name} instead of merging")
+    ap.add_argument("--db", action="store_true",
+                    help=f"refresh the SQLite mirror ({timeline_db.DB_PATH.name}) of the datasets that changed")
+    ap.add_argument("--graph", action="store_true",
+                    help=f"refresh the entity graph ({entity_graph.GRAPH_PATH.name}) from the datasets that changed")
+    ap.add_argument("--fulltext", action="store_true",
+                    help=f"refresh the full-text index ({fulltext.INDEX_PATH.name}) from the datasets that changed")
+    ap.add_argument("--snapshots", action="store_true",
+                    help="write columnar .arrow snapshots (with row counts) of the canonical CSVs that changed; needs pyarrow")
+    args = ap.parse_args()
+
     ARCHIVE.mkdir(parents=True, exist_ok=True)
-    pu = merge_master()
-    pp = merge_people()
-    pu2 = merge_unverified()
+    batches, failed = ingest_pending(args.workers)
+    report_failures(failed)
+    pu = merge_master(batches["master"], incremental=args.incremental, near_dupes=args.near_dupes)
+    pp = merge_people(batches["people"], incremental=args.incremental)
+    pu2 = merge_unverified(batches["unverified"])
     archive(pu + pp + pu2)
+    if args.db:
+        reloaded = timeline_db.sync(timeline_db.connect(sync_now=False))
+        print(f"SQLite mirror refreshed: {', '.join(reloaded) or 'no changes'}")
+    if args.graph:
+        _, changed = entity_graph.update()
+        print(f"Entity graph refreshed: {', '.join(changed) or 'no changes'}")
+    if args.fulltext:
+        _, changed = fulltext.update()
+        print(f"Full-text index refreshed: {', '.join(changed) or 'no changes'}")
+    if args.snapshots:
+        if snapshots.pa is None:
+            print("pyarrow not installed; no snapshots written")
+        else:
+            written = snapshots.update([MASTER, PEOPLE, UNVER_EVENTS, UNVER_PEOPLE, UNVER_CONN])
+            print(f"Snapshots refreshed: {', '.join(p.name for p in written) or 'no changes'}")
+    if failed:
+        raise SystemExit(f"Merged valid batches; {len(failed)} pending file(s) need fixing.")
     print("Merged events, people, and unverified leads successfully.")
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Persistent dedup key index ("<name>.keys" sidecar next to a canonical CSV).
+- Line 1: "sha256 <hex>" of the CSV bytes the index describes; then one hashed key per line, sorted
+- Membership checks need no CSV parsing; only the file checksum is verified
+- Rebuilt from the CSV automatically when the checksum does not match (hand edits, fresh clone)
+"""
+
+from __future__ import annotations
+import csv, hashlib, pathlib
+from typing import Callable, Iterable, Set
+
+from source_cache import file_sha256
+
+def key_digest(key: tuple) -> str:
+    return hashlib.sha256("\x1f".join(key).encode("utf-8", errors="ignore")).hexdigest()[:16]
+
+class KeyIndex:
+    def __init__(self, csv_path: pathlib.Path, key_fn: Callable[[dict], tuple], load: bool = True):
+        self.csv_path = csv_path
+        self.path = csv_path.with_suffix(".keys")
+        self.key_fn = key_fn
+        self.digests: Set[str] = set()
+        self.rebuilt = False
+        if load:
+            self._load()
+
+    def _load(self) -> None:
+        checksum = file_sha256(self.csv_path)
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                head = f.readline().split()
+                if head == ["sha256", checksum]:
+                    self.digests = {ln.strip() for ln in f if ln.strip()}
+                    return
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self.digests = set()
+        if self.csv_path.exists():
+            with self.csv_path.open(newline="", encoding="utf-8") as f:
+                self.digests = {key_digest(self.key_fn(r)) for r in csv.DictReader(f)}
+        self.rebuilt = True
+        self.save()
+
+    def __contains__(self, key: tuple) -> bool:
+        return key_digest(key) in self.digests
+
+    def add(self, key: tuple) -> None:
+        self.digests.add(key_digest(key))
+
+    def reset(self, keys: Iterable[tuple]) -> None:
+        self.digests = {key_digest(k) for k in keys}
+
+    def save(self) -> None:
+        """Write the sidecar against the CSV as it is on disk now (call after rewriting the CSV)."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(f"sha256 {file_sha256(self.csv_path)}\n")
+            f.writelines(d + "\n" for d in sorted(self.digests))
+        tmp.replace(self.path)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Inverted keyword index for the AI Search Agent.
+- Tokenizes every fetched feed entry / page anchor once (token -> posting list of doc ids)
+- A row's keyword list is resolved by intersecting posting lists, smallest first
+- Keeps the agent's substring semantics: a keyword matches a doc when it occurs inside any
+  token of the doc's lowercased text (keywords are [a-z0-9] runs, so they never span tokens)
+- prime() expands a whole sweep's keywords at once: one Aho-Corasick pass over the vocabulary
+"""
+
+from __future__ import annotations
+import re
+from typing import Any, Dict, Iterable, List
+
+from multimatch import Matcher
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+class KeywordIndex:
+    def __init__(self):
+        self.docs: List[Any] = []
+        self.texts: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        self._expanded: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, text: str, doc: Any) -> int:
+        doc_id = len(self.docs)
+        text = (text or "").lower()
+        self.docs.append(doc)
+        self.texts.append(text)
+        for tok in dict.fromkeys(TOKEN_RE.findall(text)):
+            self.postings.setdefault(tok, []).append(doc_id)
+        self._expanded.clear()
+        return doc_id
+
+    def postings_for(self, keyword: str) -> List[int]:
+        """Sorted ids of docs whose text contains `keyword` (memoized per keyword)."""
+        k = keyword.lower()
+        hit = self._expanded.get(k)
+        if hit is not None:
+            return hit
+        if TOKEN_RE.fullmatch(k):
+            ids = set()
+            for tok, plist in self.postings.items():
+                if k in tok:
+                    ids.update(plist)
+        else:
+            ids = {i for i, t in enumerate(self.texts) if k in t}
+        hit = self._expanded[k] = sorted(ids)
+        return hit
+
+    def prime(self, keywords: Iterable[str]) -> None:
+        """Expand many keywords together: compile them into one automaton, scan each vocabulary token once."""
+        todo = {k.lower() for k in keywords if k}
+        todo = {k for k in todo if k not in self._expanded and TOKEN_RE.fullmatch(k)}
+        if not todo:
+            return
+        matcher = Matcher((k, k) for k in todo)
+        ids: Dict[str, set] = {k: set() for k in todo}
+        for tok, plist in self.postings.items():
+            for k in matcher.scan(tok):
+                ids[k].update(plist)
+        for k, found in ids.items():
+            self._expanded[k] = sorted(found)
+
+    def match_ids(self, keywords: List[str]) -> List[int]:
+        kw = list(dict.fromkeys(k.lower() for k in keywords if k))
+        if not kw:
+            return list(range(len(self.docs)))
+        lists = sorted((self.postings_for(k) for k in kw), key=len)
+        if not lists[0]:
+            return []
+        acc = set(lists[0])
+        for plist in lists[1:]:
+            acc.intersection_update(plist)
+            if not acc:
+                return []
+        return sorted(acc)
+
+    def match(self, keywords: List[str]) -> List[Any]:
+        return [self.docs[i] for i in self.match_ids(keywords)]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern literal matcher (Aho-Corasick), used by keyword_index to resolve search_agent's row keywords.
+- Compile any number of (pattern, tag) pairs into one automaton; each text is scanned once
+- scan(text) returns the set of tags whose pattern occurs anywhere in the text
+- ignore_case=True patterns match any ASCII casing (expanded into the trie at build time)
+- Pure Python; uses the pyahocorasick C extension instead when it is installed
+"""
+
+from __future__ import annotations
+from collections import deque
+from itertools import product
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+try:
+    import ahocorasick as _pyaho
+except Exception:
+    _pyaho = None
+
+MAX_CASE_VARIANTS = 4096
+
+def case_variants(pattern: str) -> List[str]:
+    """Every ASCII upper/lower spelling of `pattern` (non-letters kept as-is)."""
+    choices = [(c.lower(), c.upper()) if c.isascii() and c.isalpha() else (c,) for c in pattern]
+    n = 1
+    for ch in choices:
+        n *= len(ch)
+    if n > MAX_CASE_VARIANTS:
+        raise ValueError(f"too many case variants for {pattern!r}; scan a lowercased text instead")
+    return ["".join(p) for p in product(*choices)]
+
+class Matcher:
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]] = (), ignore_case: bool = False,
+                 use_native: bool = True):
+        self._patterns: Dict[str, Set[Hashable]] = {}
+        self._use_native = use_native and _pyaho is not None
+        self._built = False
+        for pat, tag in patterns:
+            self.add(pat, tag, ignore_case=ignore_case)
+
+    def add(self, pattern: str, tag: Hashable, ignore_case: bool = False) -> None:
+        if not pattern:
+            return
+        for p in (case_variants(pattern) if ignore_case else [pattern]):
+            self._patterns.setdefault(p, set()).add(tag)
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def build(self) -> "Matcher":
+        if self._use_native:
+            self._auto = _pyaho.Automaton()
+            for p, tags in self._patterns.items():
+                self._auto.add_word(p, frozenset(tags))
+            self._auto.make_automaton()
+        else:
+            self._build_python()
+        self._built = True
+        return self
+
+    def _build_python(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Set[Hashable]] = [set()]
+        for p, tags in self._patterns.items():
+            node = 0
+            for ch in p:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(set())
+                node = nxt
+            out[node] |= tags
+        # BFS: failure links, then a full transition table per state (DFA), so scanning
+        # never walks failure chains; characters outside the patterns' alphabet reset to root
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[node]].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+        self._delta = delta
+        self._out = [frozenset(o) for o in out]
+
+    def scan(self, text: str) -> Set[Hashable]:
+        if not self._built:
+            self.build()
+        found: Set[Hashable] = set()
+        if not text or not self._patterns:
+            return found
+        if self._use_native:
+            for _, tags in self._auto.iter(text):
+                found |= tags
+            return found
+        delta, out = self._delta, self._out
+        node = 0
+        for ch in text:
+            node = delta[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for timeline rows (MinHash + LSH banding).
+- Text is normalized to lowercase [a-z0-9] tokens and cut into overlapping character shingles
+- Each text gets a MinHash signature (one-permutation hashing with densification: one hash per
+  shingle instead of one per shingle per permutation)
+- Signatures are split into bands; texts sharing any band bucket become candidates, so a query
+  only touches its own buckets instead of every stored row
+- Candidates are confirmed with the exact shingle Jaccard similarity before being reported
+- Numbers are identifying (docket entries, ECF numbers): a confirmed pair is still rejected when
+  each side has a number the other lacks ("ECF 12" vs "ECF 13"); a rewording that only adds or
+  drops a number (a date, a year) is kept
+"""
+
+from __future__ import annotations
+import hashlib, re
+from functools import lru_cache
+from typing import Any, Dict, List, Set, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+NUMBER_RE = re.compile(r"[0-9]+")
+MASK = (1 << 64) - 1
+
+def shingles(text: str, k: int = 5) -> Set[str]:
+    norm = " ".join(TOKEN_RE.findall((text or "").lower()))
+    if len(norm) <= k:
+        return {norm} if norm else set()
+    return {norm[i:i + k] for i in range(len(norm) - k + 1)}
+
+@lru_cache(maxsize=1 << 20)  # shingle vocabularies are small and heavily shared between rows
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def minhash(sh: Set[str], num_perm: int = 64) -> Tuple[int, ...]:
+    """One-permutation MinHash: shingle hashes are binned by h % num_perm, each bin keeps its minimum."""
+    sig: List[int] = [MASK] * num_perm
+    for s in sh:
+        v, b = divmod(_hash64(s), num_perm)
+        if v < sig[b]:
+            sig[b] = v
+    # rotation densification: an empty bin borrows the next non-empty bin's value (offset per hop)
+    if MASK in sig and any(v != MASK for v in sig):
+        filled = list(sig)
+        for i in range(num_perm):
+            if sig[i] == MASK:
+                j, hops = (i + 1) % num_perm, 1
+                while sig[j] == MASK:
+                    j, hops = (j + 1) % num_perm, hops + 1
+                filled[i] = (sig[j] + hops * 0x9E3779B97F4A7C15) & MASK
+        sig = filled
+    return tuple(sig)
+
+class NearDupIndex:
+    """
+    bands * rows_per_band == num_perm; the LSH candidate threshold is about
+    (1 / bands) ** (1 / rows_per_band) (0.5 for 16 x 4), below the confirmation `threshold`
+    so near-threshold pairs are rarely missed.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, k: int = 5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.k = k
+        self.items: List[Any] = []
+        self.texts: List[str] = []
+        self.numbers: List[Set[str]] = []
+        self.buckets: List[Dict[Tuple, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _band_keys(self, sh: Set[str]) -> List[Tuple]:
+        sig = minhash(sh, self.num_perm)
+        return [sig[b * self.rows:(b + 1) * self.rows] for b in range(self.bands)]
+
+    def add(self, item: Any, text: str) -> None:
+        sh = shingles(text, self.k)
+        if not sh:
+            return
+        n = len(self.items)
+        self.items.append(item)
+        self.texts.append(text)
+        self.numbers.append(set(NUMBER_RE.findall(text)))
+        for bucket, key in zip(self.buckets, self._band_keys(sh)):
+            bucket.setdefault(key, []).append(n)
+
+    def query(self, text: str) -> List[Tuple[Any, float]]:
+        """Stored items whose shingle Jaccard similarity with `text` is >= threshold, best first."""
+        sh = shingles(text, self.k)
+        if not sh:
+            return []
+        nums = set(NUMBER_RE.findall(text))
+        cand: Set[int] = set()
+        for bucket, key in zip(self.buckets, self._band_keys(sh)):
+            cand.update(bucket.get(key, ()))
+        hits = []
+        for n in cand:
+            if (nums - self.numbers[n]) and (self.numbers[n] - nums):  # conflicting numbers
+                continue
+            score = jaccard(sh, shingles(self.texts[n], self.k))
+            if score >= self.threshold:
+                hits.append((n, score))
+        hits.sort(key=lambda t: (-t[1], t[0]))
+        return [(self.items[n], score) for n, score in hits]
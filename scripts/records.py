@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Compact typed records for the timeline datasets.
+- One slotted class per CSV layout (no per-row dict); values are stripped once, at load time
+- Records read like the dicts they replace: r["date"], r.get("notes", ""), r.keys(), {**r}
+- Repeated values (locations, people, entities) are interned, so equal strings share one object
+- Columns: column-per-field store; interned fields are array('I') codes into a value table
+"""
+
+from __future__ import annotations
+import csv, pathlib, sys
+from array import array
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+class Record:
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    INTERN: FrozenSet[str] = frozenset()
+
+    def __init__(self, *values: str):
+        if len(values) > len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.FIELDS)} values")
+        for k, v in zip(self.FIELDS, values):
+            setattr(self, k, v)
+        for k in self.FIELDS[len(values):]:
+            setattr(self, k, "")
+
+    @classmethod
+    def from_mapping(cls: Type[R], m: Mapping) -> R:
+        """Missing/None fields become "", every value is stripped, INTERN fields are interned."""
+        rec = cls.__new__(cls)
+        for k in cls.FIELDS:
+            v = (m.get(k, "") or "").strip()
+            setattr(rec, k, sys.intern(v) if k in cls.INTERN else v)
+        return rec
+
+    def get(self, key: str, default=""):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def values(self) -> List[str]:
+        return [getattr(self, k) for k in self.FIELDS]
+
+    def items(self) -> List[Tuple[str, str]]:
+        return [(k, getattr(self, k)) for k in self.FIELDS]
+
+    def as_dict(self) -> Dict[str, str]:
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and other.values() == self.values()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+class MasterRow(Record):
+    FIELDS = ("date","location","event","participants_on_record","source_urls","notes",
+              "deep_search_event","deep_search_notes")
+    INTERN = frozenset({"date","location","deep_search_event"})
+    __slots__ = FIELDS
+
+class PeopleRow(Record):
+    FIELDS = ("date","location","event","person","role","source_urls","deep_search_person","deep_search_notes")
+    INTERN = frozenset({"date","location","person","role","deep_search_person"})
+    __slots__ = FIELDS
+
+class UnverifiedEvent(Record):
+    FIELDS = ("date","location","event","primary_source","secondary_source","confidence","notes","next_step")
+    INTERN = frozenset({"date","location","confidence"})
+    __slots__ = FIELDS
+
+class UnverifiedPerson(Record):
+    FIELDS = ("person","possible_event_date","location","alleged_association","source","confidence","notes","next_step")
+    INTERN = frozenset({"person","location","confidence"})
+    __slots__ = FIELDS
+
+class UnverifiedConnection(Record):
+    FIELDS = ("entity_a","entity_b","connection_type","source","confidence","notes","next_step")
+    INTERN = frozenset({"entity_a","entity_b","connection_type","confidence"})
+    __slots__ = FIELDS
+
+class Organization(Record):
+    FIELDS = ("entity_name","type","jurisdiction","identifier_or_ein","founded","active_years","public_sources","notes")
+    INTERN = frozenset({"type","jurisdiction"})
+    __slots__ = FIELDS
+
+class MediaAnchor(Record):
+    FIELDS = ("date","place","media_type","what_is_documented","people_on_record","source_urls","scene_notes")
+    INTERN = frozenset({"date","place","media_type","people_on_record"})
+    __slots__ = FIELDS
+
+def read_table(path: pathlib.Path, cls: Type[R]) -> Tuple[List[str], List[R]]:
+    """(header as written in the file, records); ([], []) for a missing file."""
+    if not path.exists():
+        return [], []
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = [cls.from_mapping(r) for r in reader]
+        return list(reader.fieldnames or []), rows
+
+def read_records(path: pathlib.Path, cls: Type[R]) -> List[R]:
+    return read_table(path, cls)[1]
+
+class Columns:
+    """
+    One list per field instead of one object per row. Fields in cls.INTERN are stored as
+    array('I') codes into a per-field value table (4 bytes per row plus one string per
+    distinct value), which suits locations, people and dates.
+    """
+
+    def __init__(self, cls: Type[Record], records: Iterable[Mapping] = ()):
+        self.cls = cls
+        self.header: List[str] = []
+        self.cols: Dict[str, object] = {k: (array("I") if k in cls.INTERN else []) for k in cls.FIELDS}
+        self.vocab: Dict[str, List[str]] = {k: [] for k in cls.INTERN}
+        self._codes: Dict[str, Dict[str, int]] = {k: {} for k in cls.INTERN}
+        self._n = 0
+        self.extend(records)
+
+    @classmethod
+    def from_csv(cls, path: pathlib.Path, record_cls: Type[Record]) -> "Columns":
+        """Load a CSV; .header keeps the file's own column names."""
+        cols = cls(record_cls)
+        if path.exists():
+            with path.open(newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                cols.extend(reader)
+                cols.header = list(reader.fieldnames or [])
+        return cols
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, row: Mapping) -> None:
+        for k in self.cls.FIELDS:
+            v = (row.get(k, "") or "").strip()
+            if k in self._codes:
+                codes = self._codes[k]
+                code = codes.get(v)
+                if code is None:
+                    code = codes[v] = len(self.vocab[k])
+                    self.vocab[k].append(sys.intern(v))
+                self.cols[k].append(code)
+            else:
+                self.cols[k].append(v)
+        self._n += 1
+
+    def extend(self, rows: Iterable[Mapping]) -> None:
+        for r in rows:
+            self.append(r)
+
+    def value(self, i: int, field: str) -> str:
+        col = self.cols[field]
+        return self.vocab[field][col[i]] if field in self._codes else col[i]
+
+    def column(self, field: str) -> List[str]:
+        col = self.cols[field]
+        if field in self._codes:
+            vocab = self.vocab[field]
+            return [vocab[c] for c in col]
+        return list(col)
+
+    def distinct(self, field: str) -> List[str]:
+        """Distinct values in first-seen order (interned fields: no row scan)."""
+        if field in self._codes:
+            return list(self.vocab[field])
+        return list(dict.fromkeys(self.cols[field]))
+
+    def row(self, i: int) -> Record:
+        return self.cls(*(self.value(i, k) for k in self.cls.FIELDS))
+
+    def __iter__(self) -> Iterator[Record]:
+        for i in range(self._n):
+            yield self.row(i)
+
+    def find(self, field: str, value: str) -> List[int]:
+        """Row numbers whose `field` equals `value`."""
+        if field in self._codes:
+            code: Optional[int] = self._codes[field].get(value)
+            return [] if code is None else [i for i, c in enumerate(self.cols[field]) if c == code]
+        return [i for i, v in enumerate(self.cols[field]) if v == value]
@@ -5,18 +5,31 @@ AI Search Agent (Public OSINT Only)
 - Crawls whitelisted sources (RSS & allowed pages)
 - Writes suggested links/notes back into CSVs (non-destructive: appends context)
 - Logs everything under data/ai_agent_logs/
+- Reuses unchanged sources via the on-disk HTTP cache (data/cache/http/)
+- --incremental: only re-searches new/changed rows (state in data/ai_agent_logs/search_state.json)
+- Never re-proposes a lead already given to the same row (data/logs/ai_agent/seen_links.txt)
 - NEVER accesses non-public or “dark web” content
 """
 
 from __future__ import annotations
-import csv, os, re, json, time, pathlib, hashlib
-from datetime import datetime
-from typing import List, Dict, Tuple
+import argparse, csv, io, os, re, json, time, pathlib, hashlib
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
 
 import pandas as pd
 import feedparser
-import requests
-from bs4 import BeautifulSoup
+
+from anchors import extract_anchors
+from atomic_csv import write_frame
+from fetch_engine import FetchResult, HostPolicy, fetch_all, host_of, make_session
+from http_cache import HttpCache
+from keyword_index import KeywordIndex
+from search_state import SearchState
+from seen_links import SeenLinks
+import fulltext
+import snapshots
+import timeline_db
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
@@ -29,12 +42,23 @@ PEOPLE = DATA / "verified_people_events.csv"
 UNVER_EVENTS = DATA / "unverified_events.csv"
 UNVER_PEOPLE = DATA / "unverified_people.csv"
 UNVER_CONN = DATA / "unverified_connections.csv"
+# fulltext.py dataset holding each kind of pending row
+TEXT_DATASETS = {"event": "master_timeline", "person": "verified_people_events"}
 
 WHITELIST = DATA / "sources_whitelist.csv"
+STATE_FILE = LOG_DIR / "search_state.json"  # per-row search state for --incremental
+SEEN_LINKS = DATA / "logs" / "ai_agent" / "seen_links.txt"  # (row, link) leads proposed in earlier runs
 
 USER_AGENT = "FREE-DOM-AI-Agent/1.0 (+public sources only)"
-SESSION = requests.Session()
-SESSION.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"})
+
+# Fetch engine limits: in-flight requests, per-host connections, overall deadline + per-request timeout (s)
+# Per-host pacing defaults; override per domain with the whitelist's rate_per_sec / burst / max_connections columns
+FETCH_CONCURRENCY = 8
+FETCH_PER_HOST = 2
+FETCH_HOST_RATE = 1.0
+FETCH_HOST_BURST = 2
+FETCH_DEADLINE = 120
+FETCH_TIMEOUT = 20
 
 def read_whitelist() -> List[Dict[str,str]]:
     rows = []
@@ -43,14 +67,45 @@ def read_whitelist() -> List[Dict[str,str]]:
             rows = list(csv.DictReader(f))
     return rows
 
-def safe_get(url: str, timeout: int = 20):
-    try:
-        r = SESSION.get(url, timeout=timeout)
-        if r.status_code == 200 and "text/html" in r.headers.get("content-type",""):
-            return r.text
-        return ""
-    except Exception:
-        return ""
+def host_policies(wl: List[Dict[str,str]]) -> Dict[str, HostPolicy]:
+    """Per-host limits from the whitelist; when several rows share a host the strictest value wins."""
+    fields = {"rate_per_sec": float, "burst": int, "max_connections": int}
+    given: Dict[str, Dict[str, list]] = {}
+    for r in wl:
+        host = host_of(r.get("url",""))
+        per = given.setdefault(host, {f: [] for f in fields})
+        for f, cast in fields.items():
+            raw = (r.get(f) or "").strip()
+            try:
+                if raw and cast(raw) > 0:
+                    per[f].append(cast(raw))
+            except ValueError:
+                pass
+    return {
+        host: HostPolicy(
+            rate_per_sec=min(per["rate_per_sec"], default=FETCH_HOST_RATE),
+            burst=min(per["burst"], default=FETCH_HOST_BURST),
+            max_connections=min(per["max_connections"], default=FETCH_PER_HOST),
+        )
+        for host, per in given.items()
+    }
+
+def fetch_sources(urls: List[str], policies: Dict[str, HostPolicy]) -> Dict[str, FetchResult]:
+    # Conditional GETs against data/cache/http/: unchanged sources answer 304 and reuse yesterday's body
+    cache = HttpCache()
+    fetched = fetch_all(
+        urls, concurrency=FETCH_CONCURRENCY, per_host=FETCH_PER_HOST,
+        deadline=FETCH_DEADLINE, timeout=FETCH_TIMEOUT,
+        session=make_session(USER_AGENT, pool_size=FETCH_CONCURRENCY), cache=cache,
+        host_policies=policies,
+    )
+    cache.save()
+    return fetched
+
+def page_html(res: Optional[FetchResult]) -> str:
+    if res is not None and res.ok and "text/html" in res.content_type:
+        return res.text
+    return ""
 
 def normalize_spaces(s: str) -> str:
     return " ".join((s or "").split())
@@ -71,131 +126,277 @@ def hash_key(*parts) -> str:
         h.update(str(p).encode("utf-8", errors="ignore"))
     return h.hexdigest()[:16]
 
-def search_rss(feeds: List[str], keywords: List[str], limit_per_feed: int = 30) -> List[Dict]:
-    results = []
-    kw = [k.lower() for k in keywords if k]
-    for url in feeds:
+def fetch_feeds(feeds: List[str], fetched: Dict[str, FetchResult]) -> Dict[str, List[Dict]]:
+    """Parse every fetched feed once per run; entries carry pre-lowered match text."""
+    store: Dict[str, List[Dict]] = {}
+    for url in dict.fromkeys(feeds):
+        entries = []
+        res = fetched.get(url)
+        if res is None or not res.ok:
+            store[url] = entries
+            continue
         try:
-            parsed = feedparser.parse(url)
-            for entry in (parsed.entries[:limit_per_feed] if hasattr(parsed, "entries") else []):
-                text = " ".join([
-                    entry.get("title",""),
-                    entry.get("summary",""),
-                    " ".join([t.get("term","") for t in entry.get("tags", []) if isinstance(t, dict)])
-                ]).lower()
-                if all(k in text for k in kw):
-                    results.append({
-                        "feed": url,
-                        "title": entry.get("title","").strip(),
-                        "link": entry.get("link","").strip(),
-                        "published": entry.get("published","").strip()
-                    })
+            parsed = feedparser.parse(res.body, response_headers={"content-type": res.content_type, "content-location": url})
+            for entry in (parsed.entries if hasattr(parsed, "entries") else []):
+                entries.append({
+                    "text": " ".join([
+                        entry.get("title",""),
+                        entry.get("summary",""),
+                        " ".join([t.get("term","") for t in entry.get("tags", []) if isinstance(t, dict)])
+                    ]).lower(),
+                    "title": entry.get("title","").strip(),
+                    "link": entry.get("link","").strip(),
+                    "published": entry.get("published","").strip()
+                })
         except Exception:
-            continue
-    return results
-
-def site_keyword_scan(pages: List[str], keywords: List[str], limit_per_site: int = 10) -> List[Dict]:
-    out = []
-    kw = [k.lower() for k in keywords if k]
-    for base in pages:
-        html = safe_get(base)
-        if not html: 
-            continue
-        soup = BeautifulSoup(html, "html.parser")
-        # collect anchors that stay on same domain and include keywords in text
-        anchors = soup.find_all("a", href=True)
-        count = 0
-        for a in anchors:
-            txt = (a.get_text(" ", strip=True) or "").lower()
-            if all(k in txt for k in kw) and a["href"].startswith("http"):
-                out.append({"page": base, "title": a.get_text(" ", strip=True), "link": a["href"]})
-                count += 1
-                if count >= limit_per_site:
-                    break
+            pass
+        store[url] = entries
+    return store
+
+def build_feed_index(feed_store: Dict[str, List[Dict]], limit_per_feed: int = 30) -> KeywordIndex:
+    index = KeywordIndex()
+    for url, entries in feed_store.items():
+        for entry in entries[:limit_per_feed]:
+            index.add(entry["text"], {
+                "feed": url,
+                "title": entry["title"],
+                "link": entry["link"],
+                "published": entry["published"]
+            })
+    return index
+
+def search_rss(feed_index: KeywordIndex, keywords: List[str]) -> List[Dict]:
+    return [dict(h) for h in feed_index.match(keywords)]
+
+def extract_page_anchors(page_store: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+    """(href, text) pairs per page, extracted once per run in a single streaming pass."""
+    return {base: extract_anchors(html) for base, html in page_store.items() if html}
+
+def build_anchor_index(page_anchors: Dict[str, List[Tuple[str, str]]]) -> KeywordIndex:
+    index = KeywordIndex()
+    for base, anchors in page_anchors.items():
+        # collect absolute anchors; keyword filtering happens per row against the index
+        for href, title in anchors:
+            if href.startswith("http"):
+                index.add(title, {"page": base, "title": title, "link": href})
+    return index
+
+def site_keyword_scan(anchor_index: KeywordIndex, keywords: List[str], limit_per_site: int = 10) -> List[Dict]:
+    out, per_page = [], {}
+    for hit in anchor_index.match(keywords):
+        count = per_page.get(hit["page"], 0)
+        if count < limit_per_site:
+            out.append(dict(hit))
+            per_page[hit["page"]] = count + 1
     return out
 
 def load_csv(path: pathlib.Path) -> pd.DataFrame:
     if not path.exists():
         return pd.DataFrame()
-    return pd.read_csv(path)
+    df = snapshots.read_frame(path)  # memory-mapped columnar snapshot, used only while it matches the CSV
+    return df if df is not None else pd.read_csv(path)
 
-def write_csv(path: pathlib.Path, df: pd.DataFrame):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+def load_pending_db(conn, name: str) -> pd.DataFrame:
+    """find_pending_*(load_csv(...)) answered by the SQLite mirror's status index.
 
-def keywords_for_event(row: pd.Series) -> List[str]:
+    Same index (CSV row positions) and NA handling as pandas on the CSV; only pending rows are parsed.
+    """
+    pairs = timeline_db.pending(conn, name)
+    if not pairs:
+        return pd.DataFrame()
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(timeline_db.header_of(conn, name))
+    w.writerows(row.values() for _, row in pairs)
+    buf.seek(0)
+    df = pd.read_csv(buf, dtype=str)
+    df.index = [ix for ix, _ in pairs]
+    return df
+
+def write_csv(path: pathlib.Path, df: pd.DataFrame) -> bool:
+    return write_frame(path, df)
+
+def keywords_for_event(row: Dict, table: Dict[str, List[str]] = None) -> List[str]:
     # Conservative keyword extraction (no names invented): event/location words + “Epstein”/“Maxwell” for context
-    base = " ".join([str(row.get("event","")), str(row.get("location",""))])
-    tokens = [t for t in re.split(r"[^A-Za-z0-9]+", base) if len(t) >= 3]
-    return list(dict.fromkeys([t.lower() for t in tokens]))[:6] + ["epstein", "maxwell"]
+    # `table`: the row's stored token table from fulltext.py (same tokens, already lowercased)
+    if table is None:
+        base = " ".join([str(row.get("event","")), str(row.get("location",""))])
+        words = [t.lower() for t in re.split(r"[^A-Za-z0-9]+", base)]
+    else:
+        words = table["event"] + table["location"]
+    return list(dict.fromkeys(t for t in words if len(t) >= 3))[:6] + ["epstein", "maxwell"]
 
-def keywords_for_person(row: pd.Series) -> List[str]:
-    base = " ".join([str(row.get("person","")), str(row.get("event","")), str(row.get("location",""))])
-    tokens = [t for t in re.split(r"[^A-Za-z0-9]+", base) if len(t) >= 3]
-    return list(dict.fromkeys([t.lower() for t in tokens]))[:6] + ["court", "sdny", "oversight"]
+def keywords_for_person(row: Dict, table: Dict[str, List[str]] = None) -> List[str]:
+    if table is None:
+        base = " ".join([str(row.get("person","")), str(row.get("event","")), str(row.get("location",""))])
+        words = [t.lower() for t in re.split(r"[^A-Za-z0-9]+", base)]
+    else:
+        words = table["participants"] + table["event"] + table["location"]
+    return list(dict.fromkeys(t for t in words if len(t) >= 3))[:6] + ["court", "sdny", "oversight"]
+
+def row_identity(kind: str, row: Dict) -> Tuple[str, str]:
+    """(row id from the import_pending-style key, hash of the fields the search depends on)."""
+    f = lambda k: str(row.get(k,"")).strip()
+    if kind == "person":
+        rid = hash_key("person", f("date"), f("location"), f("event"), f("person"))
+        content = hash_key(f("date"), f("location"), f("event"), f("person"), f("role"), f("source_urls"))
+    else:
+        rid = hash_key("event", f("date"), f("location"), f("event"))
+        content = hash_key(f("date"), f("location"), f("event"), f("participants_on_record"), f("source_urls"))
+    return rid, content
+
+def source_versions(fetched: Dict[str, FetchResult]) -> Dict[str, str]:
+    return {u: hashlib.sha256(r.body).hexdigest()[:16] for u, r in fetched.items() if r.ok}
+
+def append_leads(notes: str, links: List[str]) -> str:
+    """Append only links the notes don't already carry; returns the notes unchanged if none are new."""
+    new = [l for l in dict.fromkeys(links) if l and l not in notes]
+    if not new:
+        return notes
+    return (normalize_spaces(notes) + " Leads: " + "; ".join(new)).strip()
+
+# Fetched corpus shared with match workers; set once per process by the pool initializer
+_CORPUS: Dict[str, KeywordIndex] = {}
+
+def _init_corpus(feed_index: KeywordIndex, anchor_index: KeywordIndex):
+    _CORPUS["feed"] = feed_index
+    _CORPUS["anchor"] = anchor_index
+
+def match_row(kws: List[str]) -> Tuple[List[Dict], List[Dict]]:
+    return search_rss(_CORPUS["feed"], kws), site_keyword_scan(_CORPUS["anchor"], kws, limit_per_site=8)
+
+def match_rows(tasks: List[List[str]], feed_index: KeywordIndex, anchor_index: KeywordIndex,
+               workers: int = 1) -> List[Tuple[List[Dict], List[Dict]]]:
+    """(rss hits, site hits) per keyword list, in task order. workers > 1 partitions tasks across a process pool."""
+    # Every distinct keyword of the sweep goes into one automaton, so each index vocabulary is scanned once
+    all_kws = {k for kws in tasks for k in kws}
+    feed_index.prime(all_kws)
+    anchor_index.prime(all_kws)
+    if workers <= 1 or len(tasks) < 2:
+        _init_corpus(feed_index, anchor_index)
+        return [match_row(t) for t in tasks]
+    chunk = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_corpus,
+                             initargs=(feed_index, anchor_index)) as pool:
+        return list(pool.map(match_row, tasks, chunksize=chunk))
 
 def log_line(log_path: pathlib.Path, payload: Dict):
     with log_path.open("a", encoding="utf-8") as f:
         f.write(json.dumps(payload, ensure_ascii=False) + "\n")
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Public OSINT sweep for pending deep searches.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="only search new/changed rows, and existing rows against sources with new content")
+    ap.add_argument("--ttl-days", type=float, default=7.0,
+                    help="with --incremental, fully re-search a row after this many days (default: 7)")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="match pending rows on N processes (output identical to a serial run)")
+    ap.add_argument("--db", action="store_true",
+                    help="select pending rows through the SQLite mirror (scripts/timeline_db.py) instead of loading every CSV")
+    ap.add_argument("--fulltext", action="store_true",
+                    help="reuse the token tables of the persisted full-text index (scripts/fulltext.py) for row keywords")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     log_path = mk_log()
     wl = read_whitelist()
     rss_feeds = [r["url"] for r in wl if (r.get("type","rss").lower() == "rss")]
     site_pages = [r["url"] for r in wl if (r.get("type","rss").lower() != "rss")]
-
-    master = load_csv(MASTER)
-    people = load_csv(PEOPLE)
-    unver_e = load_csv(UNVER_EVENTS)
-    unver_p = load_csv(UNVER_PEOPLE)
-    unver_c = load_csv(UNVER_CONN)
-
-    if not master.empty and "deep_search_event" in master.columns:
-        pending_events = find_pending_master(master)
+    # All sources are pulled concurrently up front; one download/parse per source for the whole run
+    fetched = fetch_sources(rss_feeds + site_pages, host_policies(wl))
+    feed_store = fetch_feeds(rss_feeds, fetched)
+    page_store = {u: page_html(fetched.get(u)) for u in dict.fromkeys(site_pages)}
+    # Tokenize every entry/anchor once; rows resolve their keywords against the posting lists
+    feed_index = build_feed_index(feed_store, limit_per_feed=25)
+    anchor_index = build_anchor_index(extract_page_anchors(page_store))
+
+    versions = source_versions(fetched)
+    state = SearchState(STATE_FILE)
+    seen = SeenLinks(SEEN_LINKS)
+    now = datetime.utcnow().replace(microsecond=0)
+    ttl = timedelta(days=args.ttl_days)
+
+    # Full frames, keyed by path; with --db they are only loaded when a row gets new leads
+    frames: Dict[pathlib.Path, pd.DataFrame] = {}
+    def full_frame(path: pathlib.Path) -> pd.DataFrame:
+        if path not in frames:
+            frames[path] = load_csv(path)
+        return frames[path]
+
+    if args.db:
+        conn = timeline_db.connect()
+        pending_events = load_pending_db(conn, "master_timeline")
+        pending_people = load_pending_db(conn, "verified_people_events")
     else:
-        pending_events = pd.DataFrame()
+        master, people = full_frame(MASTER), full_frame(PEOPLE)
+        unver_e = load_csv(UNVER_EVENTS)
+        unver_p = load_csv(UNVER_PEOPLE)
+        unver_c = load_csv(UNVER_CONN)
 
-    if not people.empty and "deep_search_person" in people.columns:
-        pending_people = find_pending_people(people)
-    else:
-        pending_people = pd.DataFrame()
+        if not master.empty and "deep_search_event" in master.columns:
+            pending_events = find_pending_master(master)
+        else:
+            pending_events = pd.DataFrame()
 
-    total_hits = 0
+        if not people.empty and "deep_search_person" in people.columns:
+            pending_people = find_pending_people(people)
+        else:
+            pending_people = pd.DataFrame()
 
-    # Search for events
-    for _, row in pending_events.iterrows():
-        kws = keywords_for_event(row)
-        rss_hits = search_rss(rss_feeds, kws, limit_per_feed=25)
-        site_hits = site_keyword_scan(site_pages, kws, limit_per_site=8)
+    total_hits = 0
+    skipped = 0
+
+    # Row keywords from the full-text index's token tables (rows it does not know are tokenized here)
+    text_index = fulltext.update()[0] if args.fulltext else None
+
+    # Plan: which pending rows need a search, and against which sources
+    plan = []
+    for kind, frame in (("event", pending_events), ("person", pending_people)):
+        for ix, row in zip(frame.index, frame.to_dict("records")):
+            rid, content = row_identity(kind, row)
+            scope = state.sources_to_search(rid, content, versions, now, ttl) if args.incremental else set(versions)
+            if not scope:
+                state.keep(rid); skipped += 1
+                continue
+            table = text_index.tokens_for(TEXT_DATASETS[kind], row) if text_index else None
+            kws = keywords_for_person(row, table) if kind == "person" else keywords_for_event(row, table)
+            plan.append((kind, ix, row, rid, content, scope, kws))
+
+    # Match: pure CPU against the fetched corpus, optionally spread over --workers processes
+    matches = match_rows([p[-1] for p in plan], feed_index, anchor_index, args.workers)
+
+    # Apply in row order, so the CSVs and the JSONL log are identical to a serial run
+    for (kind, ix, row, rid, content, scope, kws), (rss_all, site_all) in zip(plan, matches):
+        # Only leads this row hasn't been given in an earlier run
+        rss_hits = [h for h in rss_all if h["feed"] in scope and not seen.seen(rid, h["link"])]
+        site_hits = [h for h in site_all if h["page"] in scope and not seen.seen(rid, h["link"])]
         hits = rss_hits[:5] + site_hits[:5]  # cap per row, keep it tidy
+        state.record(rid, content, versions, now, full=(scope == set(versions)))
+        if not hits:
+            continue
+        total_hits += len(hits)
+        for h in hits:
+            seen.add(rid, h["link"])
 
-        if hits:
-            total_hits += len(hits)
+        if kind == "event":
             # Append to notes (non-destructive). No claims, just references.
-            notes = normalize_spaces(str(row.get("notes","")))
-            append = " Leads: " + "; ".join([h["link"] for h in hits])
-            ix = row.name
-            master.at[ix, "notes"] = (notes + append).strip()
+            notes = str(row.get("notes",""))
+            updated = append_leads(notes, [h["link"] for h in hits])
+            if updated != notes:
+                full_frame(MASTER).at[ix, "notes"] = updated
             # Do not auto-flip to verified; leave deep_search_event pending for human review
 
             log_line(log_path, {
                 "type":"event", "date": str(row.get("date","")), "event": str(row.get("event","")),
                 "keywords": kws, "hits": hits
             })
-
-    # Search for people
-    for _, row in pending_people.iterrows():
-        kws = keywords_for_person(row)
-        rss_hits = search_rss(rss_feeds, kws, limit_per_feed=25)
-        site_hits = site_keyword_scan(site_pages, kws, limit_per_site=8)
-        hits = rss_hits[:5] + site_hits[:5]
-
-        if hits:
-            total_hits += len(hits)
-            notes = normalize_spaces(str(row.get("deep_search_notes","")))
-            append = " Leads: " + "; ".join([h["link"] for h in hits])
-            ix = row.name
-            people.at[ix, "deep_search_notes"] = (notes + append).strip()
+        else:
+            notes = str(row.get("deep_search_notes",""))
+            updated = append_leads(notes, [h["link"] for h in hits])
+            if updated != notes:
+                full_frame(PEOPLE).at[ix, "deep_search_notes"] = updated
 
             log_line(log_path, {
                 "type":"person", "date": str(row.get("date","")), "person": str(row.get("person","")),
@@ -203,13 +404,14 @@ def main():
             })
 
     # Write outputs
-    if not master.empty:
-        write_csv(MASTER, master)
-    if not people.empty:
-        write_csv(PEOPLE, people)
+    for path, df in frames.items():
+        if not df.empty:
+            write_csv(path, df)
+    state.save(rss_feeds + site_pages)
+    seen.save()
 
     # Summary log
-    log_line(log_path, {"summary": {"total_hits": total_hits}})
+    log_line(log_path, {"summary": {"total_hits": total_hits, "rows_skipped_unchanged": skipped}})
 
 if __name__ == "__main__":
     main()
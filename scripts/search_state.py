@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Persisted per-row state for incremental deep searches.
+- Row id: hash of the import_pending-style key (type, date, location, event[, person])
+- Records a content hash of the searchable fields, the last search time, and the
+  version (body hash) of every whitelisted source the row was searched against
+- Source versions are stored once per generation ({source_url: body_hash}, keyed by its own hash);
+  a row keeps only the id of the generation it has seen, so the file grows with rows + sources,
+  not rows x sources, and rows searched in the same run share one generation
+- A row is searched again only if it is new/changed, its re-search TTL expired,
+  or (against just those sources) when a source has new content
+"""
+
+from __future__ import annotations
+import hashlib, json, pathlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Set
+
+TS_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+def generation_id(versions: Dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(versions, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+class SearchState:
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.rows: Dict[str, Dict] = {}
+        self.generations: Dict[str, Dict[str, str]] = {}
+        self.touched: Set[str] = set()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                data = {}
+            self.generations = data.get("generations", {})
+            for rid, rec in data.get("rows", {}).items():
+                if "sources" in rec:  # older layout: a full versions map on every row
+                    rec = {k: v for k, v in rec.items() if k != "sources"}
+                    rec["generation"] = self._intern(data["rows"][rid]["sources"])
+                self.rows[rid] = rec
+
+    def _intern(self, versions: Dict[str, str]) -> str:
+        gid = generation_id(versions)
+        self.generations.setdefault(gid, dict(versions))
+        return gid
+
+    def _seen(self, rec: Dict) -> Dict[str, str]:
+        return self.generations.get(rec.get("generation", ""), {})
+
+    def sources_to_search(self, row_id: str, content: str, versions: Dict[str, str],
+                          now: datetime, ttl: timedelta) -> Set[str]:
+        """Sources this row must be (re)searched against; empty set means skip the row."""
+        prev = self.rows.get(row_id)
+        if prev is None or prev.get("content") != content:
+            return set(versions)
+        try:
+            last = datetime.strptime(prev.get("searched_at",""), TS_FMT)
+        except ValueError:
+            return set(versions)
+        if now - last >= ttl:
+            return set(versions)
+        seen = self._seen(prev)
+        return {u for u, v in versions.items() if seen.get(u) != v}
+
+    def record(self, row_id: str, content: str, versions: Dict[str, str], now: datetime,
+               full: bool) -> None:
+        prev = self.rows.get(row_id, {})
+        sources = {**self._seen(prev), **versions} if prev.get("content") == content else dict(versions)
+        self.rows[row_id] = {
+            "content": content,
+            # a partial (changed-sources-only) pass keeps the TTL clock of the last full search
+            "searched_at": now.strftime(TS_FMT) if full or not prev.get("searched_at") else prev["searched_at"],
+            "generation": self._intern(sources),
+        }
+        self.touched.add(row_id)
+
+    def keep(self, row_id: str) -> None:
+        if row_id in self.rows:
+            self.touched.add(row_id)
+
+    def save(self, whitelist: Iterable[str]) -> None:
+        # Only rows still pending this run survive; drop versions of sources no longer whitelisted,
+        # and generations no surviving row refers to
+        allowed = set(whitelist)
+        rows, generations, remap = {}, {}, {}
+        for rid in sorted(self.touched):
+            rec = self.rows[rid]
+            old = rec.get("generation", "")
+            if old not in remap:
+                kept = {u: v for u, v in sorted(self.generations.get(old, {}).items()) if u in allowed}
+                remap[old] = generation_id(kept)
+                generations[remap[old]] = kept
+            rows[rid] = {**rec, "generation": remap[old]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"generations": generations, "rows": rows}, indent=1, sort_keys=True) + "\n",
+                             encoding="utf-8")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cross-run memory of leads the AI Search Agent already proposed.
+- Stores 64-bit digests of (row id, link) pairs, one hex digest per line
+- seen_links.txt holds the sorted, de-duplicated base; new digests go to seen_links.journal
+- The journal is folded into the base (periodic compaction) once it reaches `compact_every` lines
+"""
+
+from __future__ import annotations
+import hashlib, pathlib
+from typing import Set
+
+def link_digest(row_id: str, link: str) -> str:
+    return hashlib.sha256(f"{row_id}\x1f{link.strip()}".encode("utf-8", errors="ignore")).hexdigest()[:16]
+
+def _read_digests(path: pathlib.Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    with path.open(encoding="utf-8") as f:
+        return {ln.strip() for ln in f if ln.strip()}
+
+class SeenLinks:
+    def __init__(self, path: pathlib.Path, compact_every: int = 2048):
+        self.path = path
+        self.journal = path.with_suffix(".journal")
+        self.compact_every = compact_every
+        self.digests = _read_digests(path) | _read_digests(self.journal)
+        self.new: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def seen(self, row_id: str, link: str) -> bool:
+        return link_digest(row_id, link) in self.digests
+
+    def add(self, row_id: str, link: str) -> None:
+        d = link_digest(row_id, link)
+        if d not in self.digests:
+            self.digests.add(d)
+            self.new.add(d)
+
+    def save(self) -> None:
+        if self.new:
+            self.journal.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal.open("a", encoding="utf-8") as f:
+                f.writelines(d + "\n" for d in sorted(self.new))
+            self.new.clear()
+        if self.journal.exists():
+            with self.journal.open(encoding="utf-8") as f:
+                pending = sum(1 for _ in f)
+            if pending >= self.compact_every:
+                self.compact()
+
+    def compact(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.writelines(d + "\n" for d in sorted(self.digests))
+        tmp.replace(self.path)
+        self.journal.unlink(missing_ok=True)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Columnar snapshots of the canonical CSVs ("<name>.arrow" sidecar: Arrow IPC / Feather v2, uncompressed).
+- Written from pd.read_csv(csv), so a snapshot read back is the same DataFrame the CSV gives pandas
+- Schema metadata carries the CSV's size, mtime, sha256 and row count: row_count() reads only the
+  file footer and stats the CSV
+- Readers memory-map the file and can load just the columns they need
+- The CSVs stay the source of truth: a snapshot is used only while it matches the CSV (same size
+  and mtime, or else the same sha256), otherwise callers fall back to parsing the CSV
+- pyarrow is optional; without it nothing is written and every reader falls back
+"""
+
+from __future__ import annotations
+import json, pathlib
+from typing import Iterable, List, Optional
+
+from atomic_csv import AtomicWrite
+from source_cache import file_sha256
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # snapshots are an optimization; CSV readers work without them
+    pa = None
+
+META_KEY = b"free_dom.snapshot"
+
+def snapshot_path(csv_path: pathlib.Path) -> pathlib.Path:
+    return csv_path.with_suffix(".arrow")
+
+def write_snapshot(csv_path: pathlib.Path) -> bool:
+    """(Re)write the snapshot of one CSV; returns True if the file changed."""
+    if pa is None or not csv_path.exists():
+        return False
+    import pandas as pd
+    st = csv_path.stat()  # taken first: a CSV rewritten while we read it no longer matches
+    try:
+        df = pd.read_csv(csv_path)
+    except pd.errors.EmptyDataError:
+        return False
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = {"source": csv_path.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "sha256": file_sha256(csv_path), "rows": len(df), "columns": list(df.columns)}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode("utf-8")})
+    aw = AtomicWrite(snapshot_path(csv_path), mode="wb")
+    with aw as f:
+        feather.write_feather(table, f, compression="uncompressed")
+    return aw.changed
+
+def update(paths: Iterable[pathlib.Path]) -> List[pathlib.Path]:
+    """Refresh stale snapshots; returns the CSVs whose snapshot was rewritten."""
+    return [p for p in paths if snapshot_meta(p) is None and write_snapshot(p)]
+
+def snapshot_meta(csv_path: pathlib.Path) -> Optional[dict]:
+    """
+    Snapshot metadata if a snapshot exists and matches the CSV, else None. An unchanged size and
+    mtime is taken as a match; the CSV is hashed only when they differ (e.g. after a checkout).
+    """
+    snap = snapshot_path(csv_path)
+    if pa is None or not snap.exists() or not csv_path.exists():
+        return None
+    try:
+        with pa.memory_map(str(snap)) as source:
+            raw = (pa.ipc.open_file(source).schema.metadata or {}).get(META_KEY)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    meta = json.loads(raw) if raw else None
+    if not meta:
+        return None
+    st = csv_path.stat()
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+        return meta
+    return meta if meta.get("sha256") == file_sha256(csv_path) else None
+
+def row_count(csv_path: pathlib.Path) -> Optional[int]:
+    meta = snapshot_meta(csv_path)
+    return meta["rows"] if meta else None
+
+def read_frame(csv_path: pathlib.Path, columns: Optional[List[str]] = None):
+    """Memory-mapped DataFrame from a fresh snapshot (optionally only `columns`), else None."""
+    meta = snapshot_meta(csv_path)
+    if meta is None:
+        return None
+    if columns is not None:
+        columns = [c for c in columns if c in meta["columns"]]
+    return feather.read_table(snapshot_path(csv_path), columns=columns, memory_map=True).to_pandas()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Checksums and per-source caches for artifacts derived from the canonical CSVs.
+- file_sha256: checksum of a file's bytes, the freshness test every sidecar and cache uses
+- text_digest: stable digest of a text (a row's joined values), for row-level reuse across rebuilds
+- load_versioned: a JSON cache file, or {} when missing, unreadable or of another layout version
+- refresh: a versioned JSON cache of one extract per source CSV, each stored with the CSV's checksum;
+  only sources whose CSV changed are re-extracted, and the file is rewritten only if one was
+"""
+
+from __future__ import annotations
+import hashlib, json, pathlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from atomic_csv import write_text
+
+def file_sha256(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    if path.exists():
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def load_versioned(path: pathlib.Path, version: int) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == version else {}
+
+def refresh(path: pathlib.Path, version: int, sources: Dict[str, pathlib.Path],
+            extract: Callable[[str, Optional[dict]], dict], key: str = "sources",
+            force: Iterable[str] = ()) -> Tuple[Dict[str, dict], List[str]]:
+    """
+    ({name: cached entry}, re-extracted names). extract(name, previous entry or None) returns the
+    new entry for a source whose CSV checksum changed (or that is in `force`); the entry is stored
+    under data[key][name] together with the checksum.
+    """
+    cached = load_versioned(path, version).get(key, {})
+    force = set(force)
+    changed = []
+    for name, csv_path in sources.items():
+        checksum = file_sha256(csv_path) if csv_path.exists() else ""
+        entry = cached.get(name)
+        if entry and entry["sha256"] == checksum and name not in force:
+            continue
+        cached[name] = {**extract(name, entry), "sha256": checksum}
+        changed.append(name)
+    if changed:
+        write_text(path, json.dumps({"version": version, key: cached}, ensure_ascii=False, sort_keys=True))
+    return cached, changed
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Optional SQLite mirror of the canonical datasets (data/timeline.sqlite, not committed).
+- The CSVs stay the source of truth: sync() reloads a table only when its CSV checksum changed
+- Cells are stored exactly as written in the CSV; date_start/date_end (ISO) are derived per row
+  with timeline_dates, so date-range lookups are index range scans
+- Indexed: date span, deep-search status / confidence, locations, and a person table fed by
+  person/entity columns and the semicolon lists in participants_on_record / people_on_record
+- export() writes a table back in CSV row order through atomic_csv (deterministic, diff-friendly)
+
+CLI:
+  python scripts/timeline_db.py sync
+  python scripts/timeline_db.py query master_timeline --from 2019-07 --to 2019-08 --status pending
+  python scripts/timeline_db.py query verified_people_events --person "Ghislaine Maxwell"
+  python scripts/timeline_db.py export master_timeline [--out path.csv]
+"""
+
+from __future__ import annotations
+import argparse, csv, json, pathlib, sqlite3, sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from atomic_csv import write_rows
+from source_cache import file_sha256
+from timeline_dates import parse_span
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DATA = ROOT / "data"
+DB_PATH = DATA / "timeline.sqlite"
+
+class Dataset(NamedTuple):
+    csv: pathlib.Path
+    date: Optional[str] = None      # column parsed into date_start/date_end
+    status: Optional[str] = None    # deep-search status / confidence column
+    persons: tuple = ()             # single-person columns
+    person_lists: tuple = ()        # "A; B; C" columns
+    indexed: tuple = ()             # other columns with a plain index
+
+DATASETS: Dict[str, Dataset] = {
+    "master_timeline": Dataset(DATA / "master_timeline.csv", "date", "deep_search_event",
+                               person_lists=("participants_on_record",), indexed=("location",)),
+    "verified_people_events": Dataset(DATA / "verified_people_events.csv", "date", "deep_search_person",
+                                      persons=("person",), indexed=("location",)),
+    "unverified_events": Dataset(DATA / "unverified_events.csv", "date", "confidence", indexed=("location",)),
+    "unverified_people": Dataset(DATA / "unverified_people.csv", "possible_event_date", "confidence",
+                                 persons=("person",), indexed=("location",)),
+    "unverified_connections": Dataset(DATA / "unverified_connections.csv", None, "confidence",
+                                      persons=("entity_a", "entity_b")),
+    "organizations": Dataset(DATA / "organizations.csv", indexed=("entity_name",)),
+    "photo_video_anchors": Dataset(DATA / "photo_video_anchors.csv", "date",
+                                   person_lists=("people_on_record",), indexed=("place",)),
+}
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def split_people(value: str) -> List[str]:
+    return [p.strip() for p in (value or "").split(";") if p.strip()]
+
+def connect(path: pathlib.Path = DB_PATH, sync_now: bool = True) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE IF NOT EXISTS datasets (name TEXT PRIMARY KEY, csv_sha256 TEXT, header TEXT, rows INTEGER)")
+    conn.execute("CREATE TABLE IF NOT EXISTS persons (dataset TEXT, ord INTEGER, person TEXT COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS persons_person ON persons(person, dataset)")
+    if sync_now:
+        sync(conn)
+    return conn
+
+def sync(conn: sqlite3.Connection, names: Optional[Iterable[str]] = None) -> List[str]:
+    """Reload every dataset whose CSV changed since the last sync; returns the reloaded names."""
+    reloaded = []
+    for name in (names or DATASETS):
+        ds = DATASETS[name]
+        checksum = file_sha256(ds.csv) if ds.csv.exists() else ""
+        known = conn.execute("SELECT csv_sha256 FROM datasets WHERE name = ?", (name,)).fetchone()
+        if known is not None and known[0] == checksum:
+            continue
+        with conn:
+            _load(conn, name, ds, checksum)
+        reloaded.append(name)
+    return reloaded
+
+def _load(conn: sqlite3.Connection, name: str, ds: Dataset, checksum: str) -> None:
+    header: List[str] = []
+    rows: List[List[str]] = []
+    if ds.csv.exists():
+        with ds.csv.open(newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            width = len(header)
+            rows = [(r + [""] * width)[:width] for r in reader if r]  # blank lines skipped, like DictReader/pandas
+
+    conn.execute(f"DROP TABLE IF EXISTS {_q(name)}")
+    conn.execute("DELETE FROM persons WHERE dataset = ?", (name,))
+    cols = ", ".join(f"{_q(h)} TEXT" for h in header)
+    conn.execute(f"CREATE TABLE {_q(name)} (ord INTEGER PRIMARY KEY, date_start TEXT, date_end TEXT"
+                 + (f", {cols}" if cols else "") + ")")
+
+    date_ix = header.index(ds.date) if ds.date in header else None
+    def spans(r):
+        span = parse_span(r[date_ix].strip()) if date_ix is not None else None
+        return (span.start.isoformat(), span.end.isoformat()) if span else (None, None)
+    marks = ", ".join("?" * (len(header) + 3))
+    conn.executemany(f"INSERT INTO {_q(name)} VALUES ({marks})",
+                     ((i, *spans(r), *r) for i, r in enumerate(rows)))
+
+    person_cols = [(header.index(c), False) for c in ds.persons if c in header]
+    person_cols += [(header.index(c), True) for c in ds.person_lists if c in header]
+    conn.executemany("INSERT INTO persons VALUES (?, ?, ?)",
+                     ((name, i, p) for i, r in enumerate(rows) for ix, is_list in person_cols
+                      for p in (split_people(r[ix]) if is_list else [r[ix].strip()] if r[ix].strip() else [])))
+
+    conn.execute(f"CREATE INDEX {_q(name + '_dates')} ON {_q(name)}(date_start, date_end)")
+    for col in ([ds.status] if ds.status else []) + list(ds.indexed):
+        if col in header:
+            conn.execute(f"CREATE INDEX {_q(f'{name}_{col}')} ON {_q(name)}({_q(col)} COLLATE NOCASE)")
+    conn.execute("INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?)", (name, checksum, json.dumps(header), len(rows)))
+
+def header_of(conn: sqlite3.Connection, name: str) -> List[str]:
+    row = conn.execute("SELECT header FROM datasets WHERE name = ?", (name,)).fetchone()
+    return json.loads(row[0]) if row else []
+
+def row_count(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute("SELECT rows FROM datasets WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+def select(conn: sqlite3.Connection, name: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+           person: Optional[str] = None, status: Optional[Iterable[str]] = None,
+           location: Optional[str] = None) -> List[Tuple[int, Dict[str, str]]]:
+    """
+    (CSV row position, row) pairs of one dataset, in CSV order, matching every given filter:
+    date_from/date_to: timeline date strings; rows whose span overlaps [from.start, to.end]
+    person: exact name (case-insensitive) in any person column or semicolon list
+    status: accepted values of the status column (case-insensitive; "" matches empty cells);
+            a dataset without a status column matches nothing
+    location: exact location / place / entity_name value (case-insensitive)
+    """
+    ds = DATASETS[name]
+    header = header_of(conn, name)
+    where, params = [], []
+    if date_from or date_to:
+        lo = parse_span(date_from) if date_from else None
+        hi = parse_span(date_to) if date_to else None
+        if (date_from and lo is None) or (date_to and hi is None):
+            raise ValueError(f"not a timeline date: {date_from if date_from and lo is None else date_to}")
+        if hi is not None:
+            where.append("date_start <= ?"); params.append(hi.end.isoformat())
+        if lo is not None:
+            where.append("date_end >= ?"); params.append(lo.start.isoformat())
+    if person:
+        where.append("ord IN (SELECT ord FROM persons WHERE dataset = ? AND person = ?)")
+        params += [name, person.strip()]
+    if status is not None:
+        values = list(status)
+        if ds.status in header and values:
+            where.append(f"{_q(ds.status)} COLLATE NOCASE IN ({', '.join('?' * len(values))})"); params += values
+        else:
+            where.append("0")
+    if location:
+        col = next((c for c in ds.indexed if c in header), None)
+        if col:
+            where.append(f"{_q(col)} = ? COLLATE NOCASE"); params.append(location.strip())
+    if not header:
+        return []
+    sql = (f"SELECT ord, {', '.join(_q(h) for h in header)} FROM {_q(name)}"
+           + (f" WHERE {' AND '.join(where)}" if where else "") + " ORDER BY ord")
+    return [(r[0], dict(zip(header, r[1:]))) for r in conn.execute(sql, params)]
+
+def query(conn: sqlite3.Connection, name: str, *args, **kwargs) -> List[Dict[str, str]]:
+    """Rows only; same filters as select()."""
+    return [row for _, row in select(conn, name, *args, **kwargs)]
+
+def pending(conn: sqlite3.Connection, name: str) -> List[Tuple[int, Dict[str, str]]]:
+    """(position, row) pairs whose deep-search status is empty or "pending" (the search agent's work list)."""
+    return select(conn, name, status=["", "pending"])
+
+def export(conn: sqlite3.Connection, name: str, path: Optional[pathlib.Path] = None) -> bool:
+    """Write a table as CSV (stored header, CSV row order); returns True if the file changed."""
+    return write_rows(path or DATASETS[name].csv, header_of(conn, name), query(conn, name))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SQLite mirror of the timeline CSVs.")
+    ap.add_argument("--db", default=str(DB_PATH))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("sync")
+    q = sub.add_parser("query")
+    q.add_argument("dataset", choices=sorted(DATASETS))
+    q.add_argument("--from", dest="date_from")
+    q.add_argument("--to", dest="date_to")
+    q.add_argument("--person")
+    q.add_argument("--status", action="append", help="repeatable; e.g. --status pending --status ''")
+    q.add_argument("--location")
+    e = sub.add_parser("export")
+    e.add_argument("dataset", choices=sorted(DATASETS))
+    e.add_argument("--out")
+    args = ap.parse_args(argv)
+
+    conn = connect(pathlib.Path(args.db), sync_now=False)
+    reloaded = sync(conn)
+    if args.cmd == "sync":
+        for name in DATASETS:
+            print(f"{name}: {row_count(conn, name)} rows" + (" (reloaded)" if name in reloaded else ""))
+    elif args.cmd == "query":
+        rows = query(conn, args.dataset, args.date_from, args.date_to, args.person, args.status, args.location)
+        w = csv.writer(sys.stdout)
+        w.writerow(header_of(conn, args.dataset))
+        w.writerows(r.values() for r in rows)
+    else:
+        changed = export(conn, args.dataset, pathlib.Path(args.out) if args.out else None)
+        print(f"{args.dataset}: {'written' if changed else 'unchanged'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
-import sys, csv, pathlib
-from datetime import datetime
+import sys, pathlib
+
+from records import Columns, MasterRow, PeopleRow, UnverifiedConnection, UnverifiedEvent, UnverifiedPerson
+from timeline_dates import parse_span
 
 root = pathlib.Path(__file__).resolve().parents[1]
 data_dir = root / "data"
@@ -13,62 +15,50 @@ people_headers = [
     "date","location","event","person","role","source_urls","deep_search_person","deep_search_notes"
 ]
 
-def read_csv(path):
-    if not path.exists(): return []
-    with open(path, newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+def read_csv(path, cls):
+    # column store: each distinct date string is validated once
+    return Columns.from_csv(path, cls)
 
 def check_headers(rows, required, name):
-    if not rows:
+    if not len(rows):
         # allow empty files but ensure header presence (actual headers validated by import script)
         return
-    missing = [h for h in required if h not in rows[0].keys()]
+    missing = [h for h in required if h not in rows.header]
     if missing:
         print(f"::error ::{name} missing headers: {missing}")
         sys.exit(1)
 
 def check_dates(rows, field, name):
-    for i, r in enumerate(rows, start=2):
-        val = (r.get(field,"") or "").strip()
+    # allow YYYY, YYYY-MM, YYYY-MM-DD and ranges like "YYYY-MM-DD–YYYY-MM-DD"
+    bad = {val for val in rows.distinct(field) if val and parse_span(val) is None}
+    for i, val in enumerate(rows.column(field), start=2):
         if not val:
             print(f"::warning ::{name} row {i} has empty {field}")
-            continue
-        # allow YYYY, YYYY-MM, YYYY-MM-DD and ranges like "YYYY-MM-DD–YYYY-MM-DD"
-        if "–" in val:
-            parts = val.split("–")
-            val = parts[0].strip()
-        ok = False
-        for fmt in ("%Y-%m-%d","%Y-%m","%Y"):
-            try:
-                datetime.strptime(val, fmt)
-                ok = True; break
-            except ValueError:
-                pass
-        if not ok:
-            print(f"::warning ::{name} row {i} has non-standard date '{(r.get(field,'') or '').strip()}'")
+        elif val in bad:
+            print(f"::warning ::{name} row {i} has non-standard date '{val}'")
 
 def main():
-    mt = read_csv(data_dir / "master_timeline.csv")
+    mt = read_csv(data_dir / "master_timeline.csv", MasterRow)
     check_headers(mt, master_headers, "master_timeline.csv")
     check_dates(mt, "date", "master_timeline.csv")
 
-    pe = read_csv(data_dir / "verified_people_events.csv")
+    pe = read_csv(data_dir / "verified_people_events.csv", PeopleRow)
     check_headers(pe, people_headers, "verified_people_events.csv")
     check_dates(pe, "date", "verified_people_events.csv")
 
     # Unverified validations (tolerant if empty)
-    ue = read_csv(data_dir / "unverified_events.csv")
+    ue = read_csv(data_dir / "unverified_events.csv", UnverifiedEvent)
     if ue:
         ueh = ["date","location","event","primary_source","secondary_source","confidence","notes","next_step"]
         check_headers(ue, ueh, "unverified_events.csv")
         check_dates(ue, "date", "unverified_events.csv")
 
-    up = read_csv(data_dir / "unverified_people.csv")
+    up = read_csv(data_dir / "unverified_people.csv", UnverifiedPerson)
     if up:
         uph = ["person","possible_event_date","location","alleged_association","source","confidence","notes","next_step"]
         check_headers(up, uph, "unverified_people.csv")
 
-    uc = read_csv(data_dir / "unverified_connections.csv")
+    uc = read_csv(data_dir / "unverified_connections.csv", UnverifiedConnection)
     if uc:
         uch = ["entity_a","entity_b","connection_type","source","confidence","notes","next_step"]
         check_headers(uc, uch, "unverified_connections.csv")